@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+
+# for command line arguments
+import argparse
+# for the machine readable report
+import json
+import platform
+import sys
+# for the cold start interpreters
+import subprocess
+from os.path import dirname, abspath
+# for the synthetic corpora
+from random import Random
+from tempfile import TemporaryDirectory
+# for timing and peak memory
+from time import perf_counter
+import tracemalloc
+from os.path import getsize
+
+import secret_word
+from sampler import WordSampler
+from prefetch import prepare_round
+from compile_words import compile_corpus
+
+
+"""
+Headless benchmark of the word selection and round setup hot path.
+Generates synthetic WORDS/ corpora and measures how get_word, the compiled corpus and
+the non Tk part of set_secret_word (word draw and its game state letter masks) scale.
+The report it's written as JSON: latency percentiles in microseconds, throughput per second,
+load time and peak traced memory of every scenario and corpus size.
+With --widgets the main window it's built instead (needs a display) and the label texts are
+changed as in a long hard level session, the number of widgets must stay the same.
+With --startup the cold start of the game it's timed in fresh interpreters (needs a display),
+from the first import till the login screen it's shown, against a budget, and the packages
+loaded only on use (PIL, werkzeug, peewee_validates) must not be imported till then.
+A failed check exits with 1.
+Use:
+    python benchmark.py [--sizes 1000,10000,...] [--rounds 2000] [--output report.json]
+    python benchmark.py --widgets 3600
+    python benchmark.py --startup 10 [--budget 1.0]
+
+Degree:         Faculty of Creative Arts, Technologies and Science
+Department:     Computer Science and Technology
+University:     University of Bedfordshire
+Author:         Oszkar Feher
+Date:           21 October 2022
+"""
+
+# Words per category of the default corpora
+SIZES = [1000, 10000, 100000, 1000000, 10000000]
+# Category name of the synthetic corpus
+CATEGORY = 'bench'
+# Measured calls when a category it's streamed, every call reads the whole file
+STREAM_ROUNDS = 20
+# Seconds allowed from the cold import of the game till the login screen it's shown
+STARTUP_BUDGET = 1.0
+# Packages imported only when their feature it's used
+LAZY_MODULES = ['PIL', 'werkzeug', 'peewee_validates']
+
+
+def generate_corpus(path, size, seed=0):
+    """Writes a synthetic category csv file of random words and phrases"""
+    rand = Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    with open(f'{path}/{CATEGORY}.csv', 'w') as file:
+        for _ in range(size):
+            words = [''.join(rand.choice(letters) for _ in range(rand.randint(3, 10)))
+                     for _ in range(rand.choice((1, 1, 1, 2, 3)))]
+            file.write(' '.join(words) + '\n')
+
+
+def percentiles(samples):
+    """Returns the latency summary of the samples (seconds) in microseconds"""
+    samples = sorted(samples)
+    last = len(samples) - 1
+
+    def at(p):
+        return round(samples[int(last * p)] * 1e6, 3)
+    return {'p50_us': at(0.50), 'p90_us': at(0.90), 'p99_us': at(0.99), 'max_us': at(1.0),
+            'throughput_per_s': round(len(samples) / (sum(samples) or 1e-9), 1)}
+
+
+def measure(scenario, size, load, call, rounds):
+    """
+    Measures one scenario.
+    :param scenario: - name of the scenario.
+    :param size: - words in the corpus.
+    :param load: - callable() preparing the scenario, returns the state passed to call.
+    :param call: - callable(state) measured rounds times.
+    :param rounds: - number of measured calls.
+    :return: - dictionary of the results.
+    """
+    # cold load and the first call, with the traced peak memory
+    tracemalloc.start()
+    start = perf_counter()
+    state = load()
+    call(state)
+    load_seconds = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    # warm calls, timed one by one
+    samples = []
+    for _ in range(rounds):
+        start = perf_counter()
+        call(state)
+        samples.append(perf_counter() - start)
+    result = {'scenario': scenario, 'words': size, 'rounds': rounds,
+              'load_seconds': round(load_seconds, 6), 'peak_memory_bytes': peak}
+    result.update(percentiles(samples))
+    return result
+
+
+def bench_size(size, rounds):
+    """Runs every scenario on a corpus of the given size, returns the list of results"""
+    results = []
+    with TemporaryDirectory() as path:
+        generate_corpus(path, size)
+        # too big files are streamed by the word index, far fewer calls are affordable
+        streamed = getsize(f'{path}/{CATEGORY}.csv') > secret_word.STREAM_THRESHOLD
+        calls = min(rounds, STREAM_ROUNDS) if streamed else rounds
+
+        def index():
+            # get_word reads the process wide index
+            secret_word.index = secret_word.WordIndex(path)
+            return secret_word.index
+
+        results.append(measure('get_word', size, index,
+                               lambda state: secret_word.get_word(CATEGORY), calls))
+        results.append(measure('get_word_level', size, index,
+                               lambda state: secret_word.get_word(CATEGORY, 3), calls))
+        results.append(measure('round_setup', size, lambda: WordSampler(index()),
+                               lambda sampler: prepare_round(sampler, CATEGORY, 1), calls))
+        for result in results:
+            result['streamed'] = streamed
+
+        def corpus():
+            compile_corpus(path)
+            return secret_word.open_index(path)
+
+        results.append(measure('corpus_round_setup', size, lambda: WordSampler(corpus()),
+                               lambda sampler: prepare_round(sampler, CATEGORY, 2), rounds))
+        results[-1]['streamed'] = False
+    return results
+
+
+def widget_count(widget):
+    """Number of widgets of the tree under the widget, the widget included"""
+    return 1 + sum(widget_count(child) for child in widget.winfo_children())
+
+
+def widget_check(rounds):
+    """
+    Changes every label text of the main window rounds times, as a hard level game does every second.
+    :param rounds: - number of label text changes.
+    :return: - dictionary of the widget counts, 'stable' it's False if widgets were added.
+    """
+    # imported here, the word benchmark runs without Tk, a display and the GUI packages
+    from tkinter import Tk
+    from gameGUI import GameGUI
+    root = Tk()
+    root.withdraw()
+    gui = GameGUI(root)
+    # the withdrawn window it's never drawn, the game screen it's built here
+    gui.build_game()
+    root.update_idletasks()
+    before = widget_count(root)
+    for i in range(rounds):
+        gui.banner_text.set(f'Round {i}')
+        gui.clock_text.set('Timer')
+        gui.timer_text.set('{:0>2}:{:0>2}'.format(*divmod(rounds - i, 60)))
+        gui.counter.set(f'{7 - i % 7}')
+        gui.word_text.set(' '.join('_' * (i % 12 + 1)))
+        root.update_idletasks()
+    after = widget_count(root)
+    root.destroy()
+    return {'scenario': 'widget_check', 'rounds': rounds, 'widgets_before': before,
+            'widgets_after': after, 'stable': before == after, 'passed': before == after}
+
+
+def startup_check(runs, budget=STARTUP_BUDGET, module='gameGUI'):
+    """
+    Times the cold start of the application in fresh interpreters, from the project folder:
+    the import of the module, then the GameGUI of a new Tk object till its login frame it's visible.
+    :param runs: - number of interpreters.
+    :param budget: - seconds allowed for the median time till the login screen it's shown.
+    :param module: - module name of the application.
+    :return: - dictionary of the timings, 'passed' it's False if over budget or a lazy package was imported
+               before the login screen was shown,
+               'deferred' it's True if the game screen was never built before the login screen was shown.
+    """
+    code = ('import sys, time\n'
+            't = time.perf_counter()\n'
+            'from tkinter import Tk\n'
+            f'import {module}\n'
+            'imported = time.perf_counter() - t\n'
+            'root = Tk()\n'
+            f'gui = {module}.GameGUI(root)\n'
+            'root.wait_visibility(gui.login)\n'
+            'print(imported, time.perf_counter() - t, int(gui.built))\n'
+            f'print(*[m for m in {LAZY_MODULES!r} if m in sys.modules])\n'
+            'root.destroy()\n')
+    imports, samples, eager, deferred = [], [], set(), True
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', code], cwd=dirname(abspath(__file__)),
+                                capture_output=True, text=True, check=True).stdout.splitlines()
+        imported, shown, built = output[0].split()
+        imports.append(float(imported))
+        samples.append(float(shown))
+        deferred = deferred and built == '0'
+        eager.update(output[1].split() if len(output) > 1 else [])
+    imports.sort()
+    samples.sort()
+    median = samples[len(samples) // 2]
+    return {'scenario': 'startup_login', 'module': module, 'runs': runs,
+            'import_p50_s': round(imports[len(imports) // 2], 4),
+            'p50_s': round(median, 4), 'max_s': round(samples[-1], 4), 'budget_s': budget,
+            'within_budget': median <= budget, 'deferred': deferred, 'eager_modules': sorted(eager),
+            'passed': median <= budget and not eager}
+
+
+def main(argv=None):
+    """Command line entry, prints or writes the JSON report"""
+    parser = argparse.ArgumentParser(description='Word selection and round setup benchmark')
+    parser.add_argument('--sizes', default=','.join(map(str, SIZES)),
+                        help='comma separated words per category')
+    parser.add_argument('--rounds', type=int, default=2000, help='measured calls per scenario')
+    parser.add_argument('--output', help='report file, printed if not given')
+    parser.add_argument('--widgets', type=int, metavar='ROUNDS',
+                        help='only check the widget count over ROUNDS label updates')
+    parser.add_argument('--startup', type=int, metavar='RUNS',
+                        help='only time the cold start of the game till the login screen in RUNS interpreters')
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET,
+                        help="seconds allowed till the login screen it's shown")
+    args = parser.parse_args(argv)
+
+    report = {'python': platform.python_version(), 'platform': platform.platform(),
+              'results': []}
+    if args.widgets:
+        report['results'].append(widget_check(args.widgets))
+    elif args.startup:
+        report['results'].append(startup_check(args.startup, args.budget))
+    else:
+        for size in (int(i) for i in args.sizes.split(',')):
+            report['results'].extend(bench_size(size, args.rounds))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text)
+    else:
+        print(text)
+    # a failed regression check it's a failed run
+    return 0 if all(result.get('passed', True) for result in report['results']) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+# for command line arguments
+import sys
+# for listing the csv files
+from glob import glob
+# for the category name from file path
+from os.path import basename, splitext
+# for reading the word lists
+from csv import reader
+# for packing the binary header and offsets
+from struct import pack
+
+from secret_word import WORDS_DIR, CORPUS_FILE, CORPUS_MAGIC, CORPUS_VERSION, HEADER, ENTRY, OFFSET, \
+    rank_levels
+
+
+"""
+Offline compiler of the word lists.
+Turns every WORDS/<category>.csv file into one binary corpus file which secret_word.Corpus
+memory maps, so game processes share the page cache and no file is parsed at startup.
+Layout (little endian):
+    - header:           magic, version, category count;
+    - category table:   name, word count, offset table position, word data position,
+                        easy, medium, hard word counts, level tables position;
+    - offset tables:    count + 1 unsigned int offsets per category into its word data;
+    - level tables:     unsigned int word numbers of the easy, medium and hard words per category;
+    - word data:        packed UTF-8 words per category.
+The difficulty of every word is scored here once, the game only picks from the level tables.
+Use:
+    python compile_words.py [words folder] [output file]
+
+Degree:         Faculty of Creative Arts, Technologies and Science
+Department:     Computer Science and Technology
+University:     University of Bedfordshire
+Author:         Oszkar Feher
+Date:           21 October 2022
+"""
+
+
+def read_words(path):
+    """Returns the encoded words of a csv file"""
+    with open(path, 'r') as file:
+        return [item[0].lower().encode('utf-8') for item in reader(file) if item]
+
+
+def compile_corpus(words_dir=WORDS_DIR, output=None):
+    """Compiles all csv files of the words folder into one binary corpus file.
+    :param words_dir: - folder of the csv files.
+    :param output: - corpus file path, by default inside the words folder.
+    :return: - dictionary of category name and word count.
+    """
+    output = output or f'{words_dir}/{CORPUS_FILE}'
+    corpus = {}
+    for path in sorted(glob(f'{words_dir}/*.csv')):
+        corpus[splitext(basename(path))[0]] = read_words(path)
+
+    # the tables are written after the header and category table
+    position = HEADER.size + ENTRY.size * len(corpus)
+    entries, tables, levels, blobs = [], [], [], []
+    for name, words in corpus.items():
+        offsets, end = [0], 0
+        for word in words:
+            end += len(word)
+            offsets.append(end)
+        table = pack(f'<{len(offsets)}I', *offsets)
+        tables.append(table)
+        blobs.append(b''.join(words))
+        entries.append([name.encode('utf-8'), len(words), position])
+        position += len(table)
+    # level tables follow the offset tables, word data follows the level tables
+    data = position + sum(OFFSET.size * len(words) for words in corpus.values())
+    for entry, blob, words in zip(entries, blobs, corpus.values()):
+        entry.append(data)
+        data += len(blob)
+        ranked = rank_levels([word.decode('utf-8') for word in words])
+        entry.extend(len(numbers) for numbers in ranked)
+        entry.append(position)
+        levels.append(b''.join(pack(f'<{len(numbers)}I', *numbers) for numbers in ranked))
+        position += len(levels[-1])
+
+    with open(output, 'wb') as file:
+        file.write(HEADER.pack(CORPUS_MAGIC, CORPUS_VERSION, len(entries)))
+        for entry in entries:
+            file.write(ENTRY.pack(*entry))
+        for table in tables:
+            file.write(table)
+        for level in levels:
+            file.write(level)
+        for blob in blobs:
+            file.write(blob)
+    return {name: len(words) for name, words in corpus.items()}
+
+
+if __name__ == '__main__':
+    counts = compile_corpus(*sys.argv[1:3])
+    for category, count in counts.items():
+        print(f'{category}: {count} words')
@@ -2,22 +2,25 @@
 # NOTE: noinspection -> comments are only for Pycharm editor to comply with PEP8 regulations!
 # for application exit
 import sys
-# for time display and idle
-from time import strftime, sleep
-# for password check
-from werkzeug.security import check_password_hash
+# for time display
+from time import strftime
+# for the countdown delay in whole milliseconds
+from math import ceil
 # All the graphical elements for the application
-from tkinter import (Tk, Label, Button, Frame, StringVar, IntVar,
+from tkinter import (Tk, Toplevel, Label, Button, Frame, StringVar,
                      DISABLED, NORMAL, SUNKEN, SOLID, Entry,
                      RIGHT, BOTH, CENTER)
 
 # project imports
 import variables as var
-from record import User, user, create_record
+from record import User, user, create_record, get_cursor, save_cursor, setup_database
 from record_display import all_time_records
 from frames import LogIn, Register
-from forms import UserForm
-from secret_word import get_word
+from sampler import WordSampler
+from prefetch import Prefetcher
+from game_state import MAX_MISSES, letters
+from game_session import GameSession
+from view_model import ViewModel, category_options, level_options, letter_options
 
 """
 This application it's based on the game Hangman, all rules applied with added difficulty levels.
@@ -39,35 +42,46 @@ Author:         Oszkar Feher
 Date:           21 October 2022
 """
 
+# Milliseconds before the back button it's enabled after leaving the login screen
+BACK_DELAY = 600
+# Milliseconds between the goodbye message and the exit
+EXIT_DELAY = 600
+# Milliseconds without window size change before the fonts are rescaled
+RESIZE_DELAY = 100
+
 
 class GameGUI:
     """
     GameGUI class, main application class which will be called later on using TK() class.
     All main functionality it's built in this class.
     Further functionality is explained in each method accordingly.
-    :methods: - __init__(master=root) - constructor, GUI elements;
+    :methods: - __init__(master=root) - constructor, login screen;
+              - build_game() - creates the register and game screens once the login screen it's drawn;
               - get_screen_dimensions() -> tuple: - sets width, height and position of main window
                                                 and returns a tuple of 4 values;
               - screen() - sets main window size;
-              - solve_screen() - calls a new Tk class to open a new window to enter solution;
+              - solve_screen() - shows the window to enter solution, built on first use;
+              - build_solve_screen() - creates the hidden solve window of the main window;
               - get_frame_size() -> tuple: - sets the frame size and returns a tuple;
-              - create_record(solved) - creates a game record;
+              - game_won() - displays the won game message, the record it's created by the session;
               - button_builder() - returns a Button object for creating buttons;
-              - build_frames() - building all frames for buttons, labels and new Tk window;
+              - build_login() - creates the login frame;
+              - build_frames() - building the register frame and the game screen frames;
               - build_grids() - setting the grid of each frame;
               - build_title_label() - creates the label to category display;
               - build_countdown_label() - countdown label for missed guesses;
-              - build_clock_label(*args) - creates a label for clock display;
+              - scale_countdown_label(*args) - resizes the countdown font to the window width;
+              - build_clock_label() - creates a label for clock display;
               - build_timer_label() - creates a label for timer display for difficulty level 3;
-              - build_word_label(*args) - creates a label to display the secret word to the user;
-              - timer_alert() - checks if the time ended for the difficulty level 3;
+              - build_word_label() - creates a label to display the secret word to the user;
               - draw_word() - sets the secret word into a dashed line;
               - game_status_action() - sets every parameter to default;
               - game_status() - sets game to default dependent on the game status;
               - build_abc_buttons() - creates all the buttons for the alphabet adding into a list;
               - build_category_buttons() - creates the category buttons adding into a list;
-              - buttons() - creates all the remaining buttons on the application;
-              - exit_button_event() - displays a message before exiting the application;
+              - buttons() - creates all the remaining buttons of the register and game screens;
+              - login_buttons() - creates the login screen buttons and the image buttons of the main window;
+              - exit_button_event() - displays a message and schedules the exit of the application;
               - abc_buttons_event(item) - event handler for the alphabet buttons;
               - start_stop_action(text) - events for start and stop buttons event handler;
               - start_button_event() - start button event handler, sets the game to start;
@@ -81,61 +95,86 @@ class GameGUI:
               - solve_button_event() - solve button event handler, calling the solve screen;
               - ok_solve_button_event() - checks entered word if is the secret word
               - cancel_button_event() - exits solve screen;
-              - set_secret_word() - sets secret word from the csv files;
+              - set_secret_word() -> bool: - sets secret word from the csv files, False if no word lists;
               - set_buttons_command(text) - sets and returns a point to a event handler;
               - category_buttons_event(text) - category button event handler, sets the buttons to default or disabled
                                              state;
               - level_buttons_event(text) - difficulty level buttons event handler, sets the buttons state;
-              - set_level_buttons(level) - the same as above just from level status integer;
+              - render_buttons() - sets the category, level and alphabet buttons from the game state;
               - clear_login_fields() - clears entry input;
+              - schedule_step(name, delay, callback) - runs a named transition step later, without blocking;
+              - resize_event(event) - main window <Configure> event handler, the rescale it's debounced;
+              - rescale() - resizes the shared fonts to the main window width;
+              - cancel_step(name) - cancels a scheduled transition step;
               - check_password() - checks if the entry input in the password area match;
-              - update(): - updates main window every second (1000 millisecond)
+              - start_timer(): - starts the countdown of a hard level game;
+              - tick(): - displays the time left and schedules itself for the next second change;
+              - stop_timer(): - cancels the scheduled countdown;
     """
     def __init__(self, master=None):
-        """Initializer of all widgets and frames"""
+        """Initializer of the login screen, the rest of the widgets are built by build_game()"""
 
         # Main graphical window, it will be a Tk object
         self.master = master
+        # database schema checked in the background while the widgets are built
+        setup_database()
         # font size related to main window size
         self.rem = self.master.winfo_screenwidth()
         # Member user ID
         self.user_id = None
-
-        # Call of frame builders
+        # scheduled countdown of a hard level game, None if no countdown is running
+        self.timer_job = None
+        # scheduled transition steps, name -> after() job
+        self.steps = {}
+        # solve window, built on first use
+        self.master_3 = None
+        # main window width the fonts were made for, measured on the first resize
+        self.base_width = None
+        # game screen built
+        self.built = False
+
+        # Call of the login screen builders, the only screen shown at startup
         self.screen()
+        self.build_login()
+        self.login_buttons()
+        # the game screen it's built once the login screen it's drawn, or by the first login screen event
+        self.login.bind('<Expose>', lambda event: self.master.after_idle(self.build_game))
+
+    def build_game(self):
+        """Creates the register and game screens with the game session, only once"""
+        if self.built:
+            return
+        self.built = True
+        self.login.unbind('<Expose>')
+        # Call of frame builders
         self.build_frames()
         self.build_grids()
 
-        # All displayed labels
-        # Info text traces build_title_label()
+        # All displayed labels, created once and updated in place through their textvariable
+        # Info text of the title label
         self.banner_text = StringVar()
         # set to empty string
         self.banner_text.set('')
-        self.banner_text.trace('w', self.build_title_label)
 
-        # Countdown value traces build_countdown()
+        # Countdown value, traces scale_countdown_label() for the font size
         self.counter = StringVar()
-        self.counter.trace('w', self.build_countdown_label)
+        # font size of the countdown label
+        self.count_size = None
+        self.counter.trace('w', self.scale_countdown_label)
 
-        # Clock label text traces build_clock_label()
+        # Clock label text
         self.clock_text = StringVar()
         self.clock_text.set('Clock')
-        self.clock_text.trace('w', self.build_clock_label)
 
-        # Displayed secret word text traces build_word_label()
+        # Displayed secret word text
         self.word_text = StringVar()
         self.word_text.set('Please select your category')
-        self.word_text.trace('w', self.build_word_label)
+        # last displayed secret word text set by draw_word()
+        self.drawn_word = None
 
-        # Timer label text traces build_timer()
+        # Timer label text
         self.timer_text = StringVar()
         self.timer_text.set(strftime("%H:%M"))
-        self.timer_text.trace('w', self.build_timer_label)
-
-        # Remaining time traces time_alert()
-        self.time_left = IntVar()
-        self.time_left.set(60)
-        self.time_left.trace('w', self.timer_alert)
 
         # Secret word variable
         self.secret_word = StringVar()
@@ -143,10 +182,6 @@ class GameGUI:
         self.prompt.set('random')
 
         # Predefined variables
-        # guessed letters sorted form
-        self.sorted_word = ''
-        # Selected letter with any abc button
-        self.selected_char = ''
         # difficulty level variable, default easy
         self.difficulty_status = 1
         # alphabet button list
@@ -155,18 +190,16 @@ class GameGUI:
         self.category_buttons = []
         # difficulty button list
         self.difficulty_buttons = []
-        # wrong letters list
-        self.wrong_letters = []
-        # guessed letters list
-        self.guessed_letters = []
-        # played words list
-        self.played_words = []
-        # first and last letter for easy difficulty
-        self.first_last = []
-        # alphabet dictionary to change the state of alphabet button
-        self.abc_buttons_dict = {}
-        # game status, default False
-        self.running = False
+        # difficulty level names in the order of the difficulty buttons
+        self.level_names = ['hard', 'medium', 'easy']
+        # button options cache, only the changed options are configured
+        self.view = ViewModel(self.master)
+        # non repeating word picker per category and user, cursor saved in the database
+        self.words = WordSampler(load=get_cursor, save=save_cursor)
+        # next round prepared on a worker thread for the selected category and level
+        self.prefetch = Prefetcher(self.words)
+        # game rules, timer and records, the GUI only displays the session
+        self.session = GameSession(self.words, on_record=create_record, prefetch=self.prefetch)
 
         # Call of building functions
         # creates info label
@@ -185,9 +218,11 @@ class GameGUI:
         self.build_category_buttons()
         # creates alphabet buttons
         self.build_abc_buttons()
-
-        # Update time
-        self.update()
+        # the image buttons of the main window stay above the frames created after them
+        for button in (self.rule, self.quit, self.back):
+            button.lift()
+        # the shared fonts follow the main window size
+        self.master.bind('<Configure>', self.resize_event, add='+')
 
     def get_screen_dimensions(self, mini=False) -> tuple:
         """Get the main screen size and return a tuple for geometry() method
@@ -225,11 +260,19 @@ class GameGUI:
         self.master.update_idletasks()
 
     def solve_screen(self):
-        """Creates a new Tk screen to display an entry for solution
+        """Shows the solve window with an empty entry, the window it's built only on first use"""
+        if self.master_3 is None:
+            self.build_solve_screen()
+        self.entry.delete(0, 'end')
+        self.master_3.deiconify()
+        self.master_3.lift()
+        self.entry.focus()
+
+    def build_solve_screen(self):
+        """Creates the solve window of the main window, hidden between uses
         Added an informative label, entry for input, two buttons to confirm or cancel"""
-        # New Tk object
-        # noinspection PyAttributeOutsideInit
-        self.master_3 = Tk()
+        # New window of the main Tk object
+        self.master_3 = Toplevel(self.master)
         # Main frame where the widgets are placed
         frame = Frame(self.master_3, bg=var.colours['bg'],
                       highlightbackground=var.colours['fg_enter'],
@@ -240,8 +283,6 @@ class GameGUI:
         self.master_3.overrideredirect(True)
         # Builds solve screen size and place by unpacking a tuple generated by get_screen_dimensions
         self.master_3.geometry('{0}x{1}+{2}+{3}'.format(*self.get_screen_dimensions(True)))
-        # Sets main screen to idle till further instructions
-        self.master_3.update_idletasks()
         # Placing frame on main screen
         frame.pack(fill=BOTH, expand=True)
 
@@ -303,20 +344,20 @@ class GameGUI:
         # returns a tuple
         return width, height
 
-    def create_record(self, solved=False):
-        """Creates a record by default with not solved field"""
-        if self.user_id:
-            create_record(self.user_id, self.difficulty_status, solved,
-                          len(self.guessed_letters), len(self.wrong_letters))
+    @property
+    def state(self):
+        """Letter masks of the game: letters of the word, revealed, guessed and missed letters"""
+        return self.session.state
+
+    def game_won(self):
+        """Displays the won game message, the session already created the record"""
         # Message text with the word, difficulty level and guessed letters
         result = var.result['won'].format(self.secret_word.get(),
                                           var.int_to_levels[self.difficulty_status].capitalize(),
-                                          self.guessed_letters)
+                                          letters(self.state.guessed))
         # Displaying the message
         var.message("YOU WON!", result)
         self.game_status_action()
-        # Adding played word to a list to not be picked again
-        self.played_words.append(self.secret_word.get())
 
     def button_builder(self, frame, text):
         """Creates and return a button object"""
@@ -338,8 +379,8 @@ class GameGUI:
         )
         return button
 
-    def build_frames(self):
-        """Creates all frames for the main window"""
+    def build_login(self):
+        """Creates the login frame, the first screen"""
         # Width and height for login, register and mainframe
         width, height = self.get_frame_size("m")
         # New login frame imported from frames.py. Configuring and placing onto main screen
@@ -348,6 +389,10 @@ class GameGUI:
         self.login.config(width=width, height=height)
         self.login.pack(fill=BOTH, expand=True)
 
+    def build_frames(self):
+        """Creates the register frame and the frames of the game screen"""
+        # Width and height for register and mainframe
+        width, height = self.get_frame_size("m")
         # New register frame imported from frames.py. Configuring and placing onto main screen
         # Than unmapping to not be visible till is called
         # noinspection PyAttributeOutsideInit
@@ -479,41 +524,46 @@ class GameGUI:
         self.row_category_buttons.rowconfigure(1, weight=1, uniform=u2)
 
     # noinspection PyUnusedLocal
-    def build_title_label(self, *args):
+    def build_title_label(self):
         """Informative label to display a greeting if logged in and category selection display"""
         # Setting background and foreground colours of the informative label
         bg, fg = var.set_buttons_color('title')
-        title = Label(
-            self.row_start_buttons, text=self.banner_text.get(),
+        # noinspection PyAttributeOutsideInit
+        self.title = Label(
+            self.row_start_buttons, textvariable=self.banner_text,
             bg=bg, fg=fg,
             font=var.get_font_size(self.rem, 10),
             width=6
         )
         # Adding to firs row and last 10 columns
-        title.grid(
+        self.title.grid(
             row=0, column=5, rowspan=2, columnspan=10,
             sticky='ew', padx=5, pady=2
         )
 
-    # noinspection PyUnusedLocal
-    def build_countdown_label(self, *args):
+    def build_countdown_label(self):
         """Creates a label for countdown"""
-        # setting font size related to main window size
-        em = self.master.winfo_width() // 50
         # Countdown label added to first row (0) and column (0)
         # noinspection PyAttributeOutsideInit
         self.count = Label(
             self.row_countdown_word, textvariable=self.counter,
             bg=var.colours['bg'], fg=var.colours['7'],
-            font=('Times new Roman', int(4.5*em), 'bold'),
-        )
-        self.count.grid(
-            row=0, column=0,
-            sticky='nws', padx=2*em, pady=5
         )
+        self.scale_countdown_label()
 
     # noinspection PyUnusedLocal
-    def build_clock_label(self, *args):
+    def scale_countdown_label(self, *args):
+        """Sets the countdown font size related to main window size, configured only if the size changed"""
+        em = self.master.winfo_width() // 50
+        if em != self.count_size:
+            self.count_size = em
+            self.count.config(font=('Times new Roman', int(4.5*em), 'bold'))
+            self.count.grid(
+                row=0, column=0,
+                sticky='nws', padx=2*em, pady=5
+            )
+
+    def build_clock_label(self):
         """Creates a label to display time"""
         # Label colour
         bg, fg = var.set_buttons_color('points')
@@ -528,22 +578,20 @@ class GameGUI:
         )
         self.clock.grid(row=0, column=0, sticky='news', padx=0, pady=0)
 
-    # noinspection PyUnusedLocal
-    def build_timer_label(self, *args):
+    def build_timer_label(self):
         """Creates label for timer"""
         # Label colour added to second row and first column
         bg, fg = var.set_buttons_color('timer')
         # noinspection PyAttributeOutsideInit
         self.timer = Label(
             self.column_timer,
-            text=self.timer_text.get(),
+            textvariable=self.timer_text,
             bg=bg, fg=fg,
             font=var.get_font_size(self.rem, 14)
         )
         self.timer.grid(row=1, column=0, rowspan=2, sticky='nsew')
 
-    # noinspection PyUnusedLocal
-    def build_word_label(self, *args):
+    def build_word_label(self):
         """Creates label to display secret word"""
         # Label colour added to first row and second column
         bg, fg = var.set_buttons_color('word')
@@ -557,48 +605,15 @@ class GameGUI:
                                     sticky='nse',
                                     padx=20, pady=5)
 
-    # noinspection PyUnusedLocal
-    def timer_alert(self, *args):
-        """Display a message if timer ended"""
-        if not self.time_left.get():
-            var.message("YOU LOST!", var.result['lose'])
-            self.game_status_action()
-
     def draw_word(self):
         """Drawing the secret word displayed in undescores"""
-        # output list later converted to string
-        output = []
-        # Draws the displayed word after each letter choice
-        for x in self.secret_word.get():
-            # Conditional for difficulty level, easy than add first and last letters
-            if self.difficulty_status == 1:
-                # Conditional for each letter in secret word if it's in first or last letter or already guessed letter
-                if x in self.first_last \
-                        or x in self.guessed_letters \
-                        or x in [' ', '-']:
-                    # if one of them true add to the letter to the output list
-                    output.append(x)
-                # conditional if is the selected letter
-                elif x == self.selected_char:
-                    output.append(self.selected_char)
-                # Conditional if all above fails
-                else:
-                    output.append('_')
-            # Conditional for difficulty level medium and hard displaying only dashes
-            elif self.difficulty_status >= 2:
-                # Conditional for secret letter if is in guessed letter or equals with empty space or dash
-                if x in self.guessed_letters or x in [' ', '-']:
-                    # if conditional true add to output list
-                    output.append(x)
-                # Conditional if secret letter is the selected letter than adding the selected letter to the list
-                elif x == self.selected_char:
-                    output.append(self.selected_char)
-                # Conditional if all above fails, adds an underscore
-                else:
-                    output.append('_')
-
-        # Joining the characters from the list to form the output string
-        self.word_text.set(' '.join(output))
+        # The game state shows the revealed (easy level first and last) and guessed letters,
+        # spaces and dashes, everything else as underscore
+        text = self.state.display()
+        # the label it's updated only if the displayed word changed, the StringVar it's not read back
+        if text != self.drawn_word:
+            self.drawn_word = text
+            self.word_text.set(text)
 
     def game_status_action(self):
         """Events to be handled when it's called"""
@@ -616,8 +631,6 @@ class GameGUI:
         self.back.config(state=NORMAL)
         # Solve button disabled and foreground changed to default
         self.solve.config(state=DISABLED, bg=var.colours['fg'])
-        # Sets difficulty level buttons state to default
-        self.set_level_buttons(self.difficulty_status)
         # set timer label to time
         self.timer_text.set(strftime("%H:%M"))
 
@@ -625,16 +638,14 @@ class GameGUI:
         """Checks if it's a win or a loss
         Also changes the countdown label foreground color
         depending to the misses"""
-        # Conditional for missed guesses
-        if len(self.wrong_letters) == 7:
+        # Conditional for missed guesses, the session ended the game
+        if self.session.result == 'lost':
             # Displays a message
             var.message("YOU lost!", var.result['lose'])
             self.game_status_action()
-        # Boolean for record
-        # Conditional for sorted guessed letters and the secret word, if true creates a new game record
-        if sorted(self.guessed_letters) == sorted(self.sorted_word):
-            # creates a game record solved=False
-            self.create_record()
+        # Conditional for every letter of the secret word shown, the session created the game record
+        elif self.session.result == 'won':
+            self.game_won()
 
     def build_abc_buttons(self):
         """Creates the alphabet buttons"""
@@ -659,6 +670,7 @@ class GameGUI:
                 # sets column to first (0)
                 c = 0
             b.grid(row=r, column=c, sticky='news', padx=7, pady=6)
+            self.view.track(b, state=DISABLED, bg=var.colours['bg'], disabledforeground=var.colours['dfg_abc'])
             # Adding button to the button list
             self.abc_buttons.append(b)
             c += 1
@@ -693,6 +705,7 @@ class GameGUI:
                 r += 1
                 c = 0
             b.grid(row=r, column=c, sticky='news', padx=15, pady=10)
+            self.view.track(b, state=s, bg=bg)
             # Adding button to the category list
             self.category_buttons.append(b)
             c += 1
@@ -724,28 +737,46 @@ class GameGUI:
         self.my_games = self.button_builder(self.column_game_record, 'my games')
         self.my_games.config(font=var.get_font_size(self.rem, -2),
                              overrelief=None, relief=SOLID, bd=1,
-                             command=lambda: all_time_records(self.rem, self.user_id))
+                             command=lambda: all_time_records(self.rem, self.user_id, self.master))
         self.my_games.grid(row=1, column=0, sticky='news', padx=0, pady=0)
         # All games button
         # noinspection PyAttributeOutsideInit
         self.all_games = self.button_builder(self.column_game_record, 'all games')
         self.all_games.config(font=var.get_font_size(self.rem, -2),
                               overrelief=None, relief=SOLID, bd=1,
-                              command=lambda: all_time_records(self.rem))
+                              command=lambda: all_time_records(self.rem, master=self.master))
         self.all_games.grid(row=2, column=0, sticky='news')
 
-        # Gign in button
-        # noinspection PyAttributeOutsideInit
-        self.signin = self.button_builder(self.login, 'login')
-        self.signin.config(font=var.get_font_size(self.rem, 16),
-                           text='Play as member', bd=1)
-        self.signin.grid(row=3, column=1, sticky='news', padx=110, pady=10)
         # Register confirm button
         # noinspection PyAttributeOutsideInit
         self.register = self.button_builder(self.signup, 'register')
         self.register.config(font=var.get_font_size(self.rem, 12),
                              text='Join', bd=1)
         self.register.grid(row=6, column=1, sticky='news', padx=110, pady=10)
+
+        r, s, bg = 0, NORMAL, var.colours['bg_level']
+        # Looping through difficulty levels
+        for item in self.level_names:
+            b = self.button_builder(self.column_level_buttons, item)
+            # Conditional to set the button state disabled as default the first choice
+            if item == 'easy':
+                s = DISABLED
+                bg = var.colours['fg']
+            b.config(state=s, font=var.get_font_size(self.rem, -4),
+                     command=lambda i=item: self.level_buttons_event(i), bg=bg)
+            b.grid(row=r, column=0, sticky='news', pady=3)
+            self.view.track(b, state=s, bg=bg)
+            self.difficulty_buttons.append(b)
+            r += 1
+
+    def login_buttons(self):
+        """Creates the buttons of the login screen and the image buttons of the main window"""
+        # Gign in button
+        # noinspection PyAttributeOutsideInit
+        self.signin = self.button_builder(self.login, 'login')
+        self.signin.config(font=var.get_font_size(self.rem, 16),
+                           text='Play as member', bd=1)
+        self.signin.grid(row=3, column=1, sticky='news', padx=110, pady=10)
         # Guest enter button
         # noinspection PyAttributeOutsideInit
         self.guest_enter = self.button_builder(self.login, 'guest')
@@ -799,153 +830,89 @@ class GameGUI:
         self.back.image = back
         self.back.place(relx=0.93, rely=0.02, x=0, y=0, anchor='ne')
 
-        r, s, bg = 0, NORMAL, var.colours['bg_level']
-        # Looping through difficulty levels
-        for item in ['hard', 'medium', 'easy']:
-            b = self.button_builder(self.column_level_buttons, item)
-            # Conditional to set the button state disabled as default the first choice
-            if item == 'easy':
-                s = DISABLED
-                bg = var.colours['fg']
-            b.config(state=s, font=var.get_font_size(self.rem, -4),
-                     command=lambda i=item: self.level_buttons_event(i), bg=bg)
-            b.grid(row=r, column=0, sticky='news', pady=3)
-            self.difficulty_buttons.append(b)
-            r += 1
-
-    @staticmethod
-    def exit_button_event():
-        """Static method to display a goodbye message and exit application"""
+    def exit_button_event(self):
+        """Displays a goodbye message and exits the application after a little delay,
+        the event loop keeps running meanwhile"""
         var.message('Bye', var.prompt['Bye'])
-        try:
-            # Adding a little delay before exit
-            sleep(0.6)
-            sys.exit()
-        except NotImplementedError:
-            pass
+        self.stop_timer()
+        self.schedule_step('exit', EXIT_DELAY, sys.exit)
 
     def abc_buttons_event(self, item):
         """Sets the alphabet buttons to the desired state
         depending to guesses and misses.
         calls the draw_word and game_status methods
         """
-        # Setting the selected char to alphabet button letter
-        self.selected_char = item
-        # background, disabled foreground colours, state
-        bg, dfg, s = var.colours['bg'], var.colours['dfg_abc_r'], DISABLED
-        # Conditional to check letter in secret word
-        if item in self.secret_word.get():
-            # Resetting the above variables if true
-            bg, dfg, s = var.colours['bg'], var.colours['dfg_abc_g'], DISABLED
-            # letter added to guessed letters list
-            self.guessed_letters.append(item)
-        else:
-            # If condition fails add to the wrongly guessed list
-            self.wrong_letters.append(item)
-        index = 0
-        # Looping through alphabet
-        for x in var.ALPHABET:
-            # Adding letters to a dictionary paired with an index value to configure later
-            # the corresponding button index in the button list
-            # The letters are in alphabetical order positioned as a list
-            self.abc_buttons_dict.update({x: index})
-            index += 1
-        # Updating the corresponding button related to item = letter
-        self.abc_buttons[self.abc_buttons_dict[item]].config(state=s, bg=bg, disabledforeground=dfg)
+        # Adding the guess to the game session, True if the letter it's in the secret word
+        hit = self.session.guess(item)
+        # Updating the corresponding button green or red, the buttons are in alphabetical order
+        self.view.set(self.abc_buttons[ord(item) - ord('A')], **letter_options(item, self.state, True))
         # Setting up a variable for the countdown label to display the remaining chances
-        c = 7 - len(self.wrong_letters)
+        c = MAX_MISSES - self.state.misses
         if c == 0:
-            c = 7
+            c = MAX_MISSES
         self.counter.set(f'{c}')
         # setting the countdown colour
         self.count.config(fg=var.colours[f'{c}'])
-        # redrawing the word if guessed
-        self.draw_word()
+        # redrawing the word if guessed, a miss doesn't change it
+        if hit:
+            self.draw_word()
         # calling game status
         self.game_status()
 
     def start_stop_action(self, text):
         """Event for start and stop buttons event handler"""
-        # bc = background colour for category button for 7 buttons
-        # ba = background colour for category button for 1 selected
-        # bb = background colour for abc buttons
-        # dfg = disabled foreground colour
         # s = state for start button
         # s_2 = state for stop button
-        # s_3 = state for abc buttons
-        bc, ba, bb, dfg, s, s_2, s_3 = None, None, None, None, None, None, None
+        s, s_2 = None, None
         sbg, stbg = None, None
         if text == 'start':
             # Conditional to set Time label to timer if difficulty level is 3
             if self.difficulty_status == 3:
                 self.clock_text.set('Timer')
-            # Looping through difficulty level to set the state disabled while game running
-            for x in range(3):
-                if self.difficulty_buttons[x].cget('state') == 'disabled':
-                    continue
-                else:
-                    self.difficulty_buttons[x].config(state=DISABLED)
+                # countdown scheduled only while a hard level game runs
+                self.start_timer()
             # Resetting variables to different colour when start event it's called
-            bc, ba, bb, dfg = var.colours['fg'], var.colours['fg'], var.colours['bg_abc_a'], var.colours['bg']
-            s, s_2, s_3 = DISABLED, NORMAL, NORMAL
+            s, s_2 = DISABLED, NORMAL
             sbg, stbg = var.colours['fg'], var.colours['bg_stop']
 
         if text == 'stop':
             # If conditional true, game stopped:
-            # first_last list cleared
-            self.first_last.clear()
-            # the guessed list cleared
-            self.sorted_word = ''
+            # game state cleared and countdown cancelled
+            self.stop_timer()
+            self.session.stop()
             # Info label set to empty string
             self.banner_text.set('')
             # sets Timer label to Time
             self.clock_text.set('Clock')
-            # game running is false
-            self.running = False
-            # resets difficulty level buttons to default
-            self.set_level_buttons(self.difficulty_status)
             # Resetting variables to different colour when stop event it's called
-            bc, ba, bb, dfg = var.colours['bg_cat_a'], var.colours['fg'], var.colours['bg'], var.colours['fg']
-            s, s_2, s_3 = NORMAL, DISABLED, DISABLED
+            s, s_2 = NORMAL, DISABLED
             sbg, stbg = var.colours['bg_start'], var.colours['fg']
 
         # Setting start and stop buttons to default
         self.start.config(state=s, bg=sbg)
         self.stop.config(state=s_2, bg=stbg)
-        # Looping through category buttons and setting state and background to selected category
-        for a in range(8):
-            if self.category_buttons[a].cget('text').lower() == self.prompt.get():
-                self.category_buttons[a].config(state=DISABLED, bg=ba)
-            else:
-                self.category_buttons[a].config(state=s, bg=bc)
-        # Looping through abc buttons to disable which letter are already guessed in first_last list
-        for i in range(0, 26):
-            if self.difficulty_status == 1:
-                if self.abc_buttons[i].cget('text') in self.first_last:
-                    self.abc_buttons[i].config(bg=var.colours['bg'], state=DISABLED,
-                                               disabledforeground=var.colours['dfg_abc_g'])
-                else:
-                    self.abc_buttons[i].config(bg=bb, disabledforeground=dfg, state=s_3)
-            else:
-                self.abc_buttons[i].config(bg=bb, disabledforeground=dfg, state=s_3)
+        # category, difficulty level and alphabet buttons from the running game or the selection
+        self.render_buttons()
 
     def start_button_event(self):
         """Start button event handler"""
-        # resetting timer variable to 1 minute
-        self.time_left.set(60)
-        # game running true
-        self.running = True
         # countdown set to default 7
         self.counter.set('7')
-        # setting the secret word and displaying the hidden letters
-        self.set_secret_word()
-        # disable quit and back buttons
+        self.count.config(fg=var.colours['7'])
+        # starting the game and displaying the hidden letters, without word lists no game
+        if not self.set_secret_word():
+            self.counter.set('')
+            return
+        # disable quit and back buttons, a pending back enable dropped
+        self.cancel_step('back')
         self.quit.config(state=DISABLED)
         self.back.config(state=DISABLED)
         # enable solve button
         self.solve.config(state=NORMAL, bg=var.colours['bg_start'])
         # calling event for start button
         self.start_stop_action('start')
+        # a word shown whole from the start it's already won
+        self.game_status()
 
     def stop_button_event(self):
         """Stop button event handler"""
@@ -965,17 +932,25 @@ class GameGUI:
 
     def guest_button_event(self):
         """Guest enter button event handler"""
+        # the game screen it's built now if the login screen wasn't drawn yet
+        self.build_game()
         # clears login entry fields for new input
         self.clear_login_fields()
         # Unmapping login frame
         self.login.pack_forget()
         # disable my games button for guest
         self.my_games.config(state=DISABLED, bg=var.colours['fg'])
+        # preparing the first round
+        self.prefetch.request(self.prompt.get(), self.difficulty_status, self.user_id)
         # mainframe remapping to main screen
         self.mainframe.pack(fill=BOTH, expand=True)
 
     def login_button_event(self):
         """Login button event"""
+        # for password check, imported on the first login, not at startup
+        from werkzeug.security import check_password_hash
+        # the game screen it's built now if the login screen wasn't drawn yet
+        self.build_game()
         # variable for username and password got from input entry fields
         username, password = (self.login.entries[i].get() for i in range(2))
         # user data from database for verification
@@ -992,6 +967,8 @@ class GameGUI:
                 self.banner_text.set("Welcome " + query.first().first_name)
                 # enable my games button for registered user
                 self.my_games.config(state=NORMAL, bg=var.colours['bg_score'])
+                # preparing the first round of the user
+                self.prefetch.request(self.prompt.get(), self.difficulty_status, self.user_id)
                 # unmapping login frame
                 self.login.pack_forget()
                 # remapping mainframe
@@ -1005,6 +982,8 @@ class GameGUI:
 
     def become_button_event(self):
         """Become button event to launch registration"""
+        # the register screen it's built now if the login screen wasn't drawn yet
+        self.build_game()
         # Clear login frame entry fields
         self.clear_login_fields()
         # Unmapping login frame
@@ -1014,7 +993,8 @@ class GameGUI:
 
     def registration_button_event(self):
         """Registration button event"""
-        # validator form for registration from forms.py
+        # validator form for registration from forms.py, imported on the first registration, not at startup
+        from forms import UserForm
         validator = UserForm()
         # data dictionary
         data = {}
@@ -1060,30 +1040,26 @@ class GameGUI:
         self.mainframe.pack_forget()
         # Unmapping signup frame
         self.signup.pack_forget()
-        sleep(0.4)
         # Remapping login frame
         self.login.pack(fill=BOTH, expand=True)
-        # sets user id to none
+        # sets user id to none and drops the round prepared for the user
         self.user_id = None
+        self.prefetch.cancel()
         # sets info and secret word to empty string
         self.banner_text.set("")
         self.secret_word.set("")
-        # enable 1 difficulty level button
-        self.difficulty_buttons[0].config(state=NORMAL)
-        # enable 2 difficulty level button
-        self.difficulty_buttons[1].config(state=NORMAL)
-        # disable 3 difficulty level button
-        self.difficulty_buttons[2].config(state=DISABLED)
         # enable my games button and sets background to default
         self.my_games.config(state=NORMAL, bg=var.colours['bg_score'])
         # setting difficulty level to easy
         self.difficulty_status = 1
-        # sets difficulty buttons background and foreground
-        self.set_level_buttons(1)
-        # enable back button
+        # disable back button, a pending enable dropped
+        self.cancel_step('back')
         self.back.config(state=DISABLED)
-        # clears first and last letters from the list
-        self.first_last.clear()
+        # clears the game state and cancels the countdown
+        self.stop_timer()
+        self.session.stop()
+        # sets difficulty buttons to easy selected
+        self.render_buttons()
 
     def solve_button_event(self):
         """Calls solve window"""
@@ -1091,76 +1067,43 @@ class GameGUI:
 
     def ok_solve_button_event(self):
         """Solve screen ok button event"""
-        # for adding to database
-        # Conditional to check entered word matches secret word, lowered cases to avoid error
-        if self.entry.get().lower() == self.secret_word.get().lower():
-            # resetting timer to 1 minute
-            self.time_left.set(60)
-            # creates a game record solved=True
-            self.create_record(True)
+        # hides screen till the next solve
+        self.master_3.withdraw()
+        # Conditional to check entered word matches secret word, the session creates the record solved=True
+        if self.session.solve(self.entry.get()):
+            self.game_won()
         else:
             # if condition fails shows message with negative result
             var.message("YOU LOST!", var.result['lose'])
             # calling game status events
             self.game_status_action()
-            # exits screen
-            self.master_3.destroy()
 
     def cancel_button_event(self):
-        """Cancel button. Game continues, solved screen destroyed"""
-        self.master_3.destroy()
+        """Cancel button. Game continues, solved screen hidden"""
+        self.master_3.withdraw()
 
     def set_secret_word(self):
-        """Sets the secret word by the user category choice choice or random by default"""
-        # clears guessed letters list
-        self.guessed_letters.clear()
-        # clears missed letters list
-        self.wrong_letters.clear()
-        # selected char set to empty string
-        self.selected_char = ''
-        # selected category
-        search = self.prompt.get()
-        # list of all categories
-        categories = var.categories
-
-        # Conditional t check if selected category is random
-        if search.lower() == 'random':
-            from random import choice
-            # if true a random category is selected
-            search_query = choice(categories)
-        else:
-            # if selected not random than remains selected
-            search_query = search.lower()
+        """Starts a game of the session with the user category choice or random by default"""
+        # selected category, random category it's picked when the round is prepared
+        search = self.prompt.get().lower()
 
-        # Opens available words.csv from csv file
+        # Picks from the in-memory word index, csv file it's read only on first use
         try:
-            # get a random word and set to upper case all letters
-            word = get_word(search_query).upper()
-            # Conditional to check if word was played before
-            if word in self.played_words:
-                # if true get again another word set to upper case
-                word = get_word(search_query).upper()
+            # round prepared in the background, if not ready it's prepared now
+            self.session.start(search, self.difficulty_status, self.user_id)
+            search_query = self.session.category
             # setting secret word
-            self.secret_word.set(word)
-            # Looping through word letter by letter
-            for x in word:
-                # Conditional to add first and last letters to a list for easy level
-                if x == word[0] or x == word[len(word) - 1]:
-                    if x.upper() in self.first_last:
-                        continue
-                    self.first_last.append(x.upper())
-            # Conditional to add the first and last letter for easy level
-            if self.difficulty_status == 1:
-                self.sorted_word = var.sort(word)
-            else:
-                # the medium and hard difficulty level
-                self.sorted_word = var.sort(word, True)
-            # redrawing the displayed secret word
+            self.secret_word.set(self.state.word)
+            # redrawing the displayed secret word, the label shows a message since the last game
+            self.drawn_word = None
             self.draw_word()
             # setting info label to selected category
             self.banner_text.set(search_query.capitalize())
-        except NotImplementedError:
-            pass
+            return True
+        except (FileNotFoundError, IndexError) as err:
+            # no word list in the manifest or an empty word list, the game can't start
+            var.message("Words Error", err)
+            return False
 
     def set_buttons_command(self, text):
         """Returns a direction to text related button event.
@@ -1191,12 +1134,10 @@ class GameGUI:
     def category_buttons_event(self, text):
         """Category buttons state event to set buttons availability"""
         self.prompt.set(text)
-        # Looping through each category button including random button to enable or disable
-        for a in range(8):
-            if self.category_buttons[a].cget('text').lower() == text:
-                self.category_buttons[a].config(state=DISABLED, bg=var.colours['fg'])
-            else:
-                self.category_buttons[a].config(state=NORMAL, bg=var.colours['bg_cat_a'])
+        # preparing the next round for the new category
+        self.prefetch.request(text, self.difficulty_status, self.user_id)
+        # the selected category button disabled, the rest enabled
+        self.render_buttons()
 
     def level_buttons_event(self, text):
         """Difficulty level buttons state event to set buttons state"""
@@ -1206,28 +1147,59 @@ class GameGUI:
             self.difficulty_status = 2
         if text == 'easy':
             self.difficulty_status = 1
-        # Looping through difficulty buttons to enable or disable
-        for x in range(3):
-            if self.difficulty_buttons[x].cget('text').lower() == text:
-                self.difficulty_buttons[x].config(state=DISABLED, bg=var.colours['fg'])
-            else:
-                self.difficulty_buttons[x].config(state=NORMAL, bg=var.colours['bg_level'])
-
-    def set_level_buttons(self, level):
-        """same function as above just from integer variable set the state of the buttons"""
-        for i in range(3):
-            if self.difficulty_buttons[i].cget('text').lower() == var.int_to_levels[level]:
-                self.difficulty_buttons[i].config(state=DISABLED, bg=var.colours['fg'])
-            else:
-                self.difficulty_buttons[i].config(state=NORMAL, bg=var.colours['bg_level'])
+        # preparing the next round for the new level
+        self.prefetch.request(self.prompt.get(), self.difficulty_status, self.user_id)
+        # the selected difficulty button disabled, the rest enabled
+        self.render_buttons()
+
+    def render_buttons(self):
+        """Sets the category, difficulty level and alphabet buttons from the game state and the selection.
+        Only the changed options are configured, together when idle"""
+        running = self.session.running
+        for name, b in zip(var.categories, self.category_buttons):
+            self.view.set(b, **category_options(name == self.prompt.get(), running))
+        for name, b in zip(self.level_names, self.difficulty_buttons):
+            self.view.set(b, **level_options(name == var.int_to_levels[self.difficulty_status], running))
+        for letter, b in zip(var.ALPHABET, self.abc_buttons):
+            self.view.set(b, **letter_options(letter, self.state, running))
 
     def clear_login_fields(self):
         """Clears login input and enables back button"""
         self.login.entries[0].delete(0, "end")
         self.login.entries[0].focus()
         self.login.entries[1].delete(0, "end")
-        sleep(0.6)
-        self.back.config(state=NORMAL)
+        # back button enabled a little later, the screen change it's not delayed
+        self.schedule_step('back', BACK_DELAY, lambda: self.back.config(state=NORMAL))
+
+    def schedule_step(self, name, delay, callback):
+        """Runs the callback after delay milliseconds, replacing the step of the same name"""
+        self.cancel_step(name)
+
+        def run():
+            self.steps.pop(name, None)
+            callback()
+        self.steps[name] = self.master.after(delay, run)
+
+    def resize_event(self, event):
+        """Rescales the fonts once the main window size didn't change for RESIZE_DELAY milliseconds"""
+        # child widgets report their own <Configure> through the main window binding
+        if event.widget is self.master:
+            self.schedule_step('resize', RESIZE_DELAY, self.rescale)
+
+    def rescale(self):
+        """Resizes the shared fonts to the main window width, a handful of font changes for the whole window"""
+        width = self.master.winfo_width()
+        if self.base_width is None or self.base_width <= 1:
+            self.base_width = width
+            return
+        var.scale_fonts(self.rem * width / self.base_width)
+        self.scale_countdown_label()
+
+    def cancel_step(self, name):
+        """Cancels the scheduled step of the name, if any"""
+        job = self.steps.pop(name, None)
+        if job is not None:
+            self.master.after_cancel(job)
 
     def check_password(self):
         """
@@ -1241,21 +1213,33 @@ class GameGUI:
             return False
         return True
 
-    def update(self):
-        """Master window refresh rate, 1 second"""
-        # time left for hard difficulty level
-        time_left = self.time_left.get()
-        # 3 conditions to set timer
-        if self.running and time_left and self.difficulty_status == 3:
-            minutes, seconds = var.get_time(time_left)
-            # Timer text set to 1 minute
-            self.timer_text.set(
-                '{:0>2}:{:0>2}'.format(minutes, seconds)
-            )
-            # than subtracting 1 each 1000 millisecond
-            self.time_left.set(time_left - 1)
-        # call main screen after 1000 millisecond
-        self.master.after(1000, self.update)
+    def start_timer(self):
+        """Starts the countdown of the hard level game"""
+        self.stop_timer()
+        self.tick()
+
+    def tick(self):
+        """Displays the time left of the hard level game, computed by the session from its deadline,
+        and schedules itself for the moment the displayed second changes, so it never drifts"""
+        self.timer_job = None
+        if not (self.session.running and self.session.level == 3):
+            return
+        minutes, seconds = var.get_time(self.session.time_left())
+        self.timer_text.set(
+            '{:0>2}:{:0>2}'.format(minutes, seconds)
+        )
+        # Display a message if timer ended
+        if self.session.check_time():
+            var.message("YOU LOST!", var.result['lose'])
+            self.game_status_action()
+            return
+        self.timer_job = self.master.after(ceil(self.session.tick_delay() * 1000), self.tick)
+
+    def stop_timer(self):
+        """Cancels the scheduled countdown, nothing it's scheduled while no hard level game runs"""
+        if self.timer_job is not None:
+            self.master.after_cancel(self.timer_job)
+            self.timer_job = None
 
 
 if __name__ == '__main__':
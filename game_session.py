@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+# for the hard level timer
+from math import ceil
+from time import monotonic
+
+from sampler import WordSampler
+from prefetch import prepare_round
+
+
+"""
+Game rules without any graphical element, GameGUI it's a view over a GameSession.
+A session can be played headless, for simulations, load tests and profiling.
+
+Degree:         Faculty of Creative Arts, Technologies and Science
+Department:     Computer Science and Technology
+University:     University of Bedfordshire
+Author:         Oszkar Feher
+Date:           21 October 2022
+"""
+
+# Seconds of a hard level game
+TIME_LIMIT = 60
+
+
+class GameSession:
+    """
+    GameSession class, one player's games one after the other.
+    :methods: - start(category, level, user_id) -> GameState: - starts a new game, won at once if nothing is hidden;
+              - guess(letter) -> bool: - adds a guess, True if the letter it's in the word;
+              - solve(word) -> bool: - guesses the whole word, the game ends either way;
+              - stop(): - stops the game without result;
+              - time_left() -> int: - remaining seconds of a hard level game;
+              - check_time() -> bool: - ends a hard level game if the time is up;
+              - tick_delay() -> float: - seconds till the displayed time left changes;
+              - finish(result, solved): - ends the game and creates the record of a won game;
+    """
+    def __init__(self, sampler=None, on_record=None, prefetch=None, clock=monotonic,
+                 time_limit=TIME_LIMIT):
+        """
+        Constructor.
+        :param sampler: - WordSampler the words are drawn from.
+        :param on_record: - callable(user_id, level, solved, guesses, misses) for a won game of a user.
+        :param prefetch: - optional Prefetcher preparing the next game in the background.
+        :param clock: - callable returning seconds, monotonic by default.
+        :param time_limit: - seconds of a hard level game.
+        """
+        self.sampler = sampler or WordSampler()
+        self.on_record = on_record
+        self.prefetch = prefetch
+        self.clock = clock
+        self.time_limit = time_limit
+        # choice of the game
+        self.category, self.level, self.user_id = None, 1, None
+        # letter masks of the game, kept after the end till stop() for the result display
+        self.state = None
+        # game running, result of the last game: 'won', 'lost' or None
+        self.running = False
+        self.result = None
+        # clock time when the hard level game ends
+        self.deadline = None
+
+    def start(self, category, level, user_id=None):
+        """Starts a new game, returns its GameState"""
+        selection = (category, level, user_id)
+        prepared = (self.prefetch and self.prefetch.take(*selection)) or prepare_round(self.sampler, *selection)
+        self.category, self.state = prepared
+        self.level, self.user_id = level, user_id
+        self.running, self.result = True, None
+        self.deadline = self.clock() + self.time_limit
+        # preparing the next game while this one is played
+        if self.prefetch:
+            self.prefetch.request(*selection)
+        # an easy word made only of its first and last letters (e.g. 'dad') it's won without a guess
+        if self.state.won:
+            self.finish('won')
+        return self.state
+
+    def guess(self, letter):
+        """Adds the guessed letter, returns True if it's in the word. Ends the game if won or lost"""
+        if not self.running:
+            return False
+        hit = self.state.guess(letter)
+        if self.state.lost:
+            self.finish('lost')
+        elif self.state.won:
+            self.finish('won')
+        return hit
+
+    def solve(self, word):
+        """Guesses the whole word, case insensitive. The game it's won or lost, returns True if won"""
+        if not self.running:
+            return False
+        won = word.strip().upper() == self.state.word
+        self.finish('won' if won else 'lost', solved=won)
+        return won
+
+    def stop(self):
+        """Stops the game, no result and no record"""
+        self.running = False
+        self.state = None
+        self.deadline = None
+
+    def time_left(self):
+        """Remaining seconds of the hard level game, computed from the deadline so it never drifts"""
+        if not self.running or self.level != 3:
+            return self.time_limit
+        return max(0, ceil(self.deadline - self.clock()))
+
+    def tick_delay(self):
+        """Seconds till time_left() changes, a timer waking up then is never late by a whole second"""
+        if not self.running or self.level != 3:
+            return None
+        remaining = self.deadline - self.clock()
+        # the displayed value it's the ceiling, it changes when remaining crosses a whole second
+        return max(0.0, remaining - ceil(remaining) + 1) if remaining > 0 else 0.0
+
+    def check_time(self):
+        """Ends the hard level game as lost if the time is up, returns True if it ended"""
+        if self.running and self.level == 3 and not self.time_left():
+            self.finish('lost')
+            return True
+        return False
+
+    def finish(self, result, solved=False):
+        """Ends the game, a won game of a logged in user it's recorded"""
+        self.running, self.result = False, result
+        if result == 'won' and self.user_id and self.on_record:
+            self.on_record(self.user_id, self.level, solved, self.state.guesses, self.state.misses)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+
+"""
+Degree:         Faculty of Creative Arts, Technologies and Science
+Department:     Computer Science and Technology
+University:     University of Bedfordshire
+Author:         Oszkar Feher
+Date:           21 October 2022
+"""
+
+# Alphabet of the letter bits, bit 0 is A
+ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+# Bad guesses of a game
+MAX_MISSES = 7
+
+# Difficulty level dictionary, kept here so the headless game doesn't import Tk
+int_to_levels = {1: 'easy', 2: 'medium', 3: 'hard'}
+
+
+def bit(letter):
+    """Returns the bit of an upper case letter, 0 for any other character"""
+    code = ord(letter) - 65
+    return 1 << code if 0 <= code < 26 else 0
+
+
+def mask(text):
+    """Returns the letter bits of all the letters in text"""
+    result = 0
+    for x in text:
+        result |= bit(x)
+    return result
+
+
+def count(bits):
+    """Number of letters in a mask"""
+    return bin(bits).count('1')
+
+
+def letters(bits):
+    """Returns the letters of a mask in alphabetical order"""
+    return [x for i, x in enumerate(ALPHABET) if bits >> i & 1]
+
+
+class GameState:
+    """GameState class, the state of one game kept as 26 bit letter masks.
+    A guess, the remaining letters and the win check are a few bit operations.
+    The displayed word it's a character buffer, a good guess only fills the positions of the letter.
+    :methods: - revealed_letter(letter) -> bool: - True if the letter it's shown from the start;
+              - guess(letter) -> bool: - adds the guess, True if the letter it's in the word;
+              - display() -> str: - the word with the not guessed letters as underscores;
+    """
+    def __init__(self, word, level=1):
+        """
+        Constructor.
+        :param word: - upper case secret word.
+        :param level: - difficulty level integer, easy level shows the first and last letters.
+        """
+        self.word = word
+        self.level = level
+        # letters of the word
+        self.letters = mask(word)
+        # letters shown from the start, first and last letters on easy level
+        self.revealed = mask(word[0] + word[-1]) if level == 1 and word else 0
+        # good and bad guesses
+        self.guessed = 0
+        self.missed = 0
+        # letter -> positions in the word, built once per word
+        self.positions = {}
+        for i, x in enumerate(word):
+            if bit(x):
+                self.positions.setdefault(x, []).append(i)
+        # displayed characters, hidden letters are underscores
+        self.buffer = [x if not bit(x) or self.revealed & bit(x) else '_' for x in word]
+        # displayed string, rebuilt only after the buffer changed
+        self.text = None
+
+    @property
+    def guesses(self):
+        """Number of good guesses"""
+        return count(self.guessed)
+
+    @property
+    def misses(self):
+        """Number of bad guesses"""
+        return count(self.missed)
+
+    @property
+    def remaining(self):
+        """Number of letters still to be guessed"""
+        return count(self.letters & ~(self.revealed | self.guessed))
+
+    @property
+    def won(self):
+        """True if every letter of the word is shown"""
+        return not self.letters & ~(self.revealed | self.guessed)
+
+    @property
+    def lost(self):
+        """True if all the bad guesses are used"""
+        return self.misses >= MAX_MISSES
+
+    def revealed_letter(self, letter):
+        """True if the letter it's shown from the start"""
+        return bool(self.revealed & bit(letter))
+
+    def guess(self, letter):
+        """Adds the guessed letter, returns True if it's in the word"""
+        b = bit(letter)
+        if self.letters & b:
+            # only a new letter changes the displayed word
+            if not (self.guessed | self.revealed) & b:
+                for i in self.positions[letter]:
+                    self.buffer[i] = letter
+                self.text = None
+            self.guessed |= b
+            return True
+        self.missed |= b
+        return False
+
+    def display(self):
+        """Returns the word with underscores for the hidden letters, spaces and dashes are shown"""
+        if self.text is None:
+            self.text = ' '.join(self.buffer)
+        return self.text
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+
+# for saving the built indexes
+import pickle
+# for the word numbers of a length group
+from array import array
+# for turning a bitset into word numbers in one pass
+import numpy as np
+
+import secret_word
+
+
+"""
+Pattern index of the word lists, for hints and analytics.
+The words of a category are grouped by length, every (position, letter) and every letter
+of a group has a bitset of the words in the group, stored as a Python int.
+A guess narrows the candidates with one AND of bitsets, the word list it's never scanned again.
+The index it's built from the words of the word index, saved in WORDS/ as <category>.idx
+and loaded only when the category it's first used. It's stamped with the stamp of the words it was
+built from, so it's rebuilt when the word index swaps in edited words or reads the compiled corpus.
+
+Degree:         Faculty of Creative Arts, Technologies and Science
+Department:     Computer Science and Technology
+University:     University of Bedfordshire
+Author:         Oszkar Feher
+Date:           21 October 2022
+"""
+
+# File extension of the saved indexes
+INDEX_EXTENSION = 'idx'
+# Version of the saved index format
+INDEX_VERSION = 2
+
+
+def bitset(numbers, size):
+    """Returns the bitset (int) of the numbers, all smaller than size"""
+    bits = bytearray((size + 7) // 8)
+    for n in numbers:
+        bits[n >> 3] |= 1 << (n & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def members(bits, size):
+    """Returns the numbers of the set bits in increasing order, all smaller than size.
+    The bitset it's unpacked into one bit per byte at once, no bit is cleared one by one."""
+    data = np.frombuffer(bits.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(data, bitorder='little'))
+
+
+class Group:
+    """Group class, bitsets of the words of one length.
+    :methods: - all() -> int: - bitset of every word of the group;
+              - at(position, letter) -> int: - bitset of the words with the letter at the position;
+              - having(letter) -> int: - bitset of the words containing the letter;
+    """
+    def __init__(self, numbers, at, having):
+        """
+        Constructor.
+        :param numbers: - array of the word numbers of the group, a bit index maps to it.
+        :param at: - dictionary of (position, letter) and bitset.
+        :param having: - dictionary of letter and bitset.
+        """
+        self.numbers = numbers
+        self.positions = at
+        self.letters = having
+
+    def all(self):
+        """Bitset of every word of the group"""
+        return (1 << len(self.numbers)) - 1
+
+    def at(self, position, letter):
+        """Bitset of the words with the letter at the position"""
+        return self.positions.get((position, letter), 0)
+
+    def having(self, letter):
+        """Bitset of the words containing the letter"""
+        return self.letters.get(letter, 0)
+
+
+class Narrowing:
+    """Narrowing class, candidate words of one game narrowed guess by guess.
+    :methods: - reveal(letter, positions): - keeps the words with the letter exactly at the positions;
+              - miss(letter): - drops the words containing the letter;
+              - numbers() -> ndarray: - word numbers of the candidates;
+    """
+    def __init__(self, group, length):
+        """Constructor, all the words of the length are candidates"""
+        self.group = group
+        self.length = length
+        self.bits = group.all() if group else 0
+
+    def reveal(self, letter, positions):
+        """Keeps the words with the letter at the positions and nowhere else"""
+        if not self.group:
+            return
+        for p in range(self.length):
+            if p in positions:
+                self.bits &= self.group.at(p, letter)
+            else:
+                self.bits &= ~self.group.at(p, letter)
+
+    def miss(self, letter):
+        """Drops the words containing the letter"""
+        if self.group:
+            self.bits &= ~self.group.having(letter)
+
+    def count(self):
+        """Number of candidates"""
+        return bin(self.bits).count('1')
+
+    def numbers(self):
+        """Returns the word numbers of the candidates"""
+        if not self.group:
+            return np.empty(0, dtype=np.uint32)
+        numbers = np.frombuffer(self.group.numbers, dtype=np.uint32)
+        return numbers[members(self.bits, len(numbers))]
+
+
+class PatternIndex:
+    """PatternIndex class, lazily loaded pattern indexes of the categories.
+    :methods: - build(category) -> dict: - builds the length groups of a category;
+              - load(category) -> dict: - loads, or builds and saves, the index of a category;
+              - narrowing(category, length) -> Narrowing: - candidate set of a new game;
+              - candidates(category, pattern, missed) -> ndarray: - word numbers fitting a pattern;
+    """
+    def __init__(self, index=None, path=secret_word.WORDS_DIR):
+        """
+        Constructor.
+        :param index: - word index with stamp(), count() and word() methods, by default secret_word.index.
+        :param path: - folder of the csv files and the saved indexes.
+        """
+        self.index = index or secret_word.index
+        self.path = path
+        # category name -> length -> Group
+        self.groups = {}
+        # category name -> stamp of the words the groups were built from
+        self.stamps = {}
+
+    def build(self, category):
+        """Returns the length groups of the category words"""
+        lengths = {}
+        for i in range(self.index.count(category)):
+            lengths.setdefault(len(self.index.word(category, i)), []).append(i)
+        groups = {}
+        for length, numbers in lengths.items():
+            at, having = {}, {}
+            for j, number in enumerate(numbers):
+                word = self.index.word(category, number).upper()
+                for p, x in enumerate(word):
+                    at.setdefault((p, x), []).append(j)
+                for x in set(word):
+                    having.setdefault(x, []).append(j)
+            size = len(numbers)
+            groups[length] = Group(array('I', numbers),
+                                   {key: bitset(value, size) for key, value in at.items()},
+                                   {key: bitset(value, size) for key, value in having.items()})
+        return groups
+
+    def load(self, category):
+        """Returns the length groups of the category, built and saved only if the saved index is stale.
+        The groups kept in memory are dropped when the word index reads other words."""
+        stamp = self.index.stamp(category)
+        if self.stamps.get(category) != stamp:
+            file_path = f'{self.path}/{category}.{INDEX_EXTENSION}'
+            groups = None
+            try:
+                with open(file_path, 'rb') as file:
+                    version, saved_stamp, saved = pickle.load(file)
+                if version == INDEX_VERSION and saved_stamp == stamp:
+                    groups = saved
+            except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+                pass
+            if groups is None:
+                groups = self.build(category)
+                # words swapped in during the build, the index it's built again from the new words
+                while self.index.stamp(category) != stamp:
+                    stamp = self.index.stamp(category)
+                    groups = self.build(category)
+                try:
+                    with open(file_path, 'wb') as file:
+                        pickle.dump((INDEX_VERSION, stamp, groups), file, pickle.HIGHEST_PROTOCOL)
+                except OSError as err:
+                    print(err)
+            self.groups[category], self.stamps[category] = groups, stamp
+        return self.groups[category]
+
+    def narrowing(self, category, length):
+        """Returns the candidate set of a new game of the category with a word of the length"""
+        return Narrowing(self.load(category).get(length), length)
+
+    def candidates(self, category, pattern, missed=''):
+        """
+        Word numbers fitting the pattern.
+        :param category: - category of the secret word.
+        :param pattern: - displayed word characters, '_' for a hidden letter.
+        :param missed: - letters guessed wrong.
+        :return: - array of word numbers.
+        """
+        narrowing = self.narrowing(category, len(pattern))
+        shown = {}
+        for p, x in enumerate(pattern):
+            if x != '_':
+                shown.setdefault(x, set()).add(p)
+        for letter, positions in shown.items():
+            narrowing.reveal(letter, positions)
+        for letter in missed:
+            narrowing.miss(letter)
+        return narrowing.numbers()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+# for preparing the next round in the background
+from threading import Thread, Lock
+
+import secret_word
+from game_state import GameState
+
+
+"""
+Degree:         Faculty of Creative Arts, Technologies and Science
+Department:     Computer Science and Technology
+University:     University of Bedfordshire
+Author:         Oszkar Feher
+Date:           21 October 2022
+"""
+
+
+def prepare_round(sampler, category, level, user_id=None):
+    """
+    Prepares everything a new round needs, without any Tk call.
+    :param sampler: - WordSampler to draw the word from.
+    :param category: - selected category or 'random'.
+    :param level: - difficulty level integer.
+    :param user_id: - logged in user ID or None.
+    :return: - tuple of category and the GameState of the upper case word.
+    """
+    # random or missing category it's replaced by one of the word files found at startup
+    category = secret_word.resolve(category, sampler.index)
+    # words are drawn from the difficulty level of the word index
+    word = sampler.draw(category, user_id, level).upper()
+    # letter masks of the word, easy level reveals the first and last letters
+    return category, GameState(word, level)
+
+
+class Prefetcher:
+    """Prefetcher class, prepares the next round on a worker thread while a game runs,
+    so the start button only swaps in the ready data.
+    A round is prepared for a (category, level, user) choice, a new request replaces it.
+    :methods: - request(category, level, user_id): - starts preparing the round of the choice;
+              - cancel(): - drops the prepared or running round;
+              - take(category, level, user_id) -> tuple: - returns the prepared round or None;
+    """
+    def __init__(self, sampler):
+        """Constructor"""
+        self.sampler = sampler
+        # guards key and ready, shared with the worker thread
+        self.lock = Lock()
+        # choice of the round being prepared
+        self.key = None
+        # prepared round
+        self.ready = None
+        # running worker
+        self.thread = None
+
+    def request(self, category, level, user_id=None):
+        """Starts preparing the round of the choice, unless it's already prepared or running"""
+        key = (category, level, user_id)
+        with self.lock:
+            if key == self.key:
+                return
+            self.key, self.ready = key, None
+        self.thread = Thread(target=self.work, args=(key,), daemon=True)
+        self.thread.start()
+
+    def work(self, key):
+        """Worker thread, keeps the round only if its choice wasn't changed meanwhile"""
+        try:
+            prepared = prepare_round(self.sampler, *key)
+        except (FileNotFoundError, IndexError):
+            # the start button will prepare it again and report the problem
+            prepared = None
+        with self.lock:
+            if key == self.key:
+                self.ready = prepared
+
+    def cancel(self):
+        """Drops the prepared round, a running worker result will be ignored"""
+        with self.lock:
+            self.key, self.ready = None, None
+
+    def take(self, category, level, user_id=None):
+        """Returns the prepared round of the choice and clears it, None if it's another choice"""
+        key = (category, level, user_id)
+        thread = self.thread
+        # the round is being prepared, waiting is never slower than preparing it again
+        if thread and key == self.key:
+            thread.join()
+        with self.lock:
+            if key != self.key:
+                return None
+            prepared, self.key, self.ready = self.ready, None, None
+        return prepared
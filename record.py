@@ -2,11 +2,11 @@
 # NOTE: noinspection -> comments are only for Pycharm editor to comply with PEP8 regulations!
 # for adding current time to a game record
 import datetime
+# for checking the schema without delaying the first window
+from threading import Thread, Event, Lock
 
 # ORM for Models and database connectivity
 from peewee import *
-# for password hashing
-from werkzeug.security import generate_password_hash
 
 """
 Degree:         Faculty of Creative Arts, Technologies and Science
@@ -52,6 +52,10 @@ class User(Abstract):
     """
     games = IntegerField(default=0)
 
+    class Meta:
+        # records view sorted by user reads the users in first name order
+        indexes = ((('first_name',), False),)
+
     # noinspection PyShadowingNames
     @classmethod
     def create_user(cls, first_name, last_name, username,
@@ -65,6 +69,9 @@ class User(Abstract):
         :param admin: - boolean, user not admin so it's false.
         :return: - string if user already exists with same username or email.
         """
+        # for password hashing, imported on the first registration, not at startup
+        from werkzeug.security import generate_password_hash
+        ready()
         try:
             # Makes sure that all fields are given and than it can save it.
             # If input fields are just half given, entry will not be saved and protects the database from
@@ -92,31 +99,212 @@ class GameRecord(BaseModel):
     misses = IntegerField()
     timestamp = DateField(default=datetime.datetime.now)
 
+    class Meta:
+        # indexes of the sorted and filtered columns of the records view, created with the tables
+        indexes = ((('guesses',), False),
+                   (('misses',), False),
+                   (('timestamp',), False),
+                   (('level', 'misses'), False),
+                   (('level', 'timestamp'), False))
+
+
+class WordCursor(BaseModel):
+    """Word cursor model for saving the shuffle bag state of a user per category and level,
+    so the words are not repeated after a new login.
+    :inherit: BaseModel()
+    """
+    user_id = ForeignKeyField(User)
+    category = CharField(max_length=40)
+    level = IntegerField(default=0)
+    seed = IntegerField()
+    cursor = IntegerField()
+    size = IntegerField()
+
+    class Meta:
+        # one cursor per user, category and level
+        indexes = ((('user_id', 'category', 'level'), True),)
+
 
 def user(username):
     """Return a user by username"""
+    ready()
     return User().select().where(User.username == username)
 
 
-def create_record(user_id, level, solved, guesses, misses):
-    """Creates a game record."""
+def level_text(level):
+    """Returns the saved text of a difficulty level integer."""
     if level == 3:
-        text = 'Hard'
+        return 'Hard'
     elif level == 2:
-        text = 'Medium'
+        return 'Medium'
+    return 'Easy'
+
+
+def create_record(user_id, level, solved, guesses, misses):
+    """Creates a game record."""
+    ready()
+    GameRecord.create(user_id=user_id, level=level_text(level), solved=solved, guesses=guesses, misses=misses)
+
+
+def insert_records(rows, batch=500):
+    """
+    Bulk inserts game records, one transaction for all rows.
+    :param rows: - iterable of (user_id, level, solved, guesses, misses) tuples, level as integer.
+    :param batch: - rows per INSERT statement, SQLite limits the variables of one statement.
+    :return: - number of inserted rows.
+    """
+    rows = [{'user_id': user_id, 'level': level_text(level), 'solved': solved,
+             'guesses': guesses, 'misses': misses}
+            for user_id, level, solved, guesses, misses in rows]
+    ready()
+    with db.atomic():
+        for i in range(0, len(rows), batch):
+            GameRecord.insert_many(rows[i:i + batch]).execute()
+    return len(rows)
+
+
+def get_cursor(user_id, category, level):
+    """Returns the saved (seed, cursor, size) of the user category level or None."""
+    ready()
+    cursor = WordCursor.get_or_none(WordCursor.user_id == user_id, WordCursor.category == category,
+                                    WordCursor.level == level)
+    if cursor:
+        return cursor.seed, cursor.cursor, cursor.size
+    return None
+
+
+def save_cursor(user_id, category, level, seed, cursor, size):
+    """Saves the shuffle bag state of the user category level, replacing the previous one."""
+    ready()
+    WordCursor.replace(user_id=user_id, category=category, level=level, seed=seed,
+                       cursor=cursor, size=size).execute()
+
+
+# Difficulty rank of the saved level text, written as SQL with no parameters so the
+# expression index created with the schema matches it and the level sort reads the index
+LEVEL_RANK = "CASE level WHEN 'Easy' THEN 1 WHEN 'Medium' THEN 2 ELSE 3 END"
+level_rank = SQL(LEVEL_RANK)
+
+# Sort keys of the records view -> sorted expressions before the ID, all of them read from an index,
+# same first names are kept apart by the user ID
+record_sorts = {
+    'id': (),
+    'user': (User.first_name, User.id),
+    'level': (level_rank,),
+    'guesses': (GameRecord.guesses,),
+    'misses': (GameRecord.misses,),
+    'date': (GameRecord.timestamp,)
+}
+
+
+def record_query(user_id=None, order='id', descending=False, level=None, search=None):
+    """
+    Returns the query of the displayed records, sorted and filtered by SQLite.
+    The rows have the displayed columns first and the sort key values after them.
+    :param user_id: - records of the user only, without the user column.
+    :param order: - sort key of record_sorts.
+    :param descending: - True for descending order.
+    :param level: - difficulty level integer, records of the level only.
+    :param search: - records of the users whose first name or username contains the text.
+    :return: - query of tuples.
+    """
+    sorts = record_sorts[order]
+    if user_id:
+        query = GameRecord.select(GameRecord.id, GameRecord.level, GameRecord.guesses,
+                                  GameRecord.misses, GameRecord.timestamp, *sorts).join(User).where(
+            GameRecord.user_id == user_id)
+    else:
+        query = GameRecord.select(GameRecord.id, User.first_name, GameRecord.level, GameRecord.guesses,
+                                  GameRecord.misses, GameRecord.timestamp, *sorts).join(User)
+    if level:
+        query = query.where(GameRecord.level == level_text(level))
+    if search:
+        query = query.where(User.first_name.contains(search) | User.username.contains(search))
+    # the ID breaks ties, a stable order, so a page continues exactly after the previous one
+    fields = sorts + (GameRecord.id,)
+    if descending:
+        return query.order_by(*[field.desc() for field in fields])
+    return query.order_by(*fields)
+
+
+def record_key(row, order='id'):
+    """Returns the sort key values and the ID of a record row, the position of the row in the sorted records."""
+    size = len(record_sorts[order])
+    return tuple(row[len(row) - size:]) + (row[0],)
+
+
+def count_records(query):
+    """Returns the number of rows of a record query, counted by SQLite."""
+    ready()
+    return query.count()
+
+
+def page_records(query, limit, offset=0, after=None, order='id', descending=False):
+    """
+    Returns one page of a record query as a list of tuples, only the page it's read.
+    :param query: - query of record_query().
+    :param limit: - rows of the page.
+    :param offset: - position of the first row, used only without after.
+    :param after: - last row of the previous page, the page it's sought in the index right after it.
+    :param order: - sort key of the query.
+    :param descending: - True if the query it's in descending order.
+    :return: - list of tuples.
+    """
+    ready()
+    if after is None:
+        return list(query.limit(limit).offset(offset).tuples())
+    fields = record_sorts[order] + (GameRecord.id,)
+    key = record_key(after, order)
+    # the first sort key alone starts the index search, the row values skip the rows up to the last one
+    if descending:
+        query = query.where(fields[0] <= key[0], Tuple(*fields) < Tuple(*key))
     else:
-        text = 'Easy'
-    GameRecord.create(user_id=user_id, level=text, solved=solved, guesses=guesses, misses=misses)
+        query = query.where(fields[0] >= key[0], Tuple(*fields) > Tuple(*key))
+    return list(query.limit(limit).tuples())
 
 
 def select_all_records():
     """Selects all Game records in a descending order."""
+    ready()
     return GameRecord.select().order_by(GameRecord.misses.desc())
 
 
-# Connects to the database
-db.connect()
-# Creates tables, if exists don't take action
-db.create_tables([GameRecord, User], safe=True)
-# Closing database connection
-db.close()
+# Schema check started, schema check finished
+schema_started = False
+schema_lock = Lock()
+schema_ready = Event()
+
+
+def create_schema():
+    """Creates the tables and indexes, if exists don't take action."""
+    try:
+        # Connects to the database
+        db.connect(reuse_if_open=True)
+        # Creates tables, if exists don't take action
+        db.create_tables([GameRecord, User, WordCursor], safe=True)
+        # Expression index of the level sort, peewee indexes only columns
+        db.execute_sql(f'CREATE INDEX IF NOT EXISTS "gamerecord_level_rank" ON "gamerecord" ({LEVEL_RANK})')
+        # Closing database connection
+        db.close()
+    finally:
+        schema_ready.set()
+
+
+def setup_database(background=True):
+    """Starts the schema check once, on a background thread by default so the first window isn't delayed."""
+    global schema_started
+    # the game thread and the prefetch thread may both need the database first
+    with schema_lock:
+        if schema_started:
+            return
+        schema_started = True
+    if background:
+        Thread(target=create_schema, daemon=True).start()
+    else:
+        create_schema()
+
+
+def ready():
+    """Waits for the schema check, runs it now if it was never started. Called before every database use."""
+    setup_database(background=False)
+    schema_ready.wait()
@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 # NOTE: noinspection -> comments are only for Pycharm editor to comply with PEP8 regulations!
 
-from tkinter import Tk, Frame, Button, BOTH
+from tkinter import Toplevel, Frame, Button, BOTH
 import variables as st
-from record import User, GameRecord
-from table import Table
+from record import record_query, count_records, page_records
+from table import VirtualTable, FilterBar
 
 
 """
@@ -16,51 +16,113 @@ Date:           21 October 2022
 """
 
 
-def all_time_records(rem, user_id=None):
-    """Crates a new window to display records"""
-    # New Tk class
-    # noinspection PyAttributeOutsideInit
-    master = Tk(className="All records")
-    # Frame for the window
-    # noinspection PyAttributeOutsideInit
-    frame = Frame(master, bg=st.colours['fg'],
-                  highlightbackground=st.colours['fg_enter'],
-                  highlightcolor=st.colours['fg_enter'],
-                  highlightthickness=3)
-    # width, height of the window
-    x, y = 850, 550
-    # for the user one column less, the window has to be smaller
-    if user_id:
-        x, y = 646, 550
-    # dimensions for geometry: width, height, x position, y position on the mani screen
-    dimensions = (x, y, int(master.winfo_screenwidth() // 2 - x / 2),
-                  int(master.winfo_screenheight() // 2 - y / 2))
-    # creating the screen
-    master.geometry('{}x{}+{}+{}'.format(*dimensions))
-    # Removing minimise and closing ability
-    master.overrideredirect(True)
-    # Idle till further instructions
-    master.update_idletasks()
-    # frame added to main window
-    frame.pack(fill=BOTH, expand=True)
-
-    # Dataset list to be displayed in a table
-    data = [i for i in GameRecord.select(GameRecord.id, User.first_name,
-                                         GameRecord.level, GameRecord.guesses,
-                                         GameRecord.misses).join(User).tuples()]
-    # columns for the table
-    fields = ['Nr', 'User', 'Difficulty', 'Guesses', 'Missed']
-    # if there is a user change the dataset and columns
-    if user_id:
-        data = [i for i in GameRecord.select(GameRecord.id, GameRecord.level, GameRecord.guesses,
-                                             GameRecord.misses).join(User).where(GameRecord.user_id == user_id).tuples()]
-        fields = ['Nr', 'Difficulty', 'Gueses', 'Missed']
-    # Creates a table
-    Table(frame, rem, data, fields, 0, 0)
-
-    # Creates a button for main window
-    ok = Button(frame, bg=st.colours['bg'],
-                bd=1, fg=st.colours['fg_enter'], font=st.get_font_size(rem, 3),
-                text='Ok', command=lambda: master.destroy(),
-                activeforeground='black', activebackground=st.colours['fg'], width=10)
-    ok.place(relx=0.5, rely=0.96, anchor='s')
+class RecordWindow:
+    """RecordWindow class, a records window built once and hidden between uses.
+    The records are sorted by the clicked column heading and filtered by the filter bar, both done by SQLite.
+    :methods: - show(user_id): - fills the table with the records and shows the window;
+              - fetch(after, offset, limit) -> list: - page of the records for the table;
+              - sort(column, descending): - table heading event, sorts by the column;
+              - filter(level, search): - filter bar event, keeps the records of the level and users;
+              - build_query() -> query: - record query of the current choices;
+              - refresh(): - builds the query of the current choices and shows the first rows;
+              - hide(): - hides the window till the next use;
+    """
+    def __init__(self, rem, user_id=None, master=None):
+        """
+        Constructor.
+        :param rem: - font size.
+        :param user_id: - user ID if the records of one user are displayed, the layout has one column less.
+        :param master: - main Tk object, the window it's its Toplevel.
+        """
+        # New window of the main Tk object
+        self.master = Toplevel(master)
+        self.master.title("All records")
+        # Frame for the window
+        frame = Frame(self.master, bg=st.colours['fg'],
+                      highlightbackground=st.colours['fg_enter'],
+                      highlightcolor=st.colours['fg_enter'],
+                      highlightthickness=3)
+        # width, height of the window
+        x, y = 1050, 600
+        # for the user one column less, the window has to be smaller
+        if user_id:
+            x, y = 846, 600
+        # dimensions for geometry: width, height, x position, y position on the mani screen
+        dimensions = (x, y, int(self.master.winfo_screenwidth() // 2 - x / 2),
+                      int(self.master.winfo_screenheight() // 2 - y / 2))
+        # creating the screen
+        self.master.geometry('{}x{}+{}+{}'.format(*dimensions))
+        # Removing minimise and closing ability
+        self.master.overrideredirect(True)
+        # frame added to main window
+        frame.pack(fill=BOTH, expand=True)
+
+        # user, sort key, descending order, level integer, search text of the query
+        self.user_id, self.order, self.descending, self.level, self.search = user_id, 'id', False, None, None
+        # Query of the records to be displayed, the rows are read page by page while scrolling
+        self.query = self.build_query()
+        # columns for the table and their sort keys
+        fields = ['Nr', 'User', 'Difficulty', 'Guesses', 'Missed', 'Date']
+        self.keys = ['id', 'user', 'level', 'guesses', 'misses', 'date']
+        # if there is a user change the columns
+        if user_id:
+            fields = ['Nr', 'Difficulty', 'Gueses', 'Missed', 'Date']
+            self.keys.remove('user')
+        # Filter bar above the table, the user search only for all records
+        FilterBar(frame, rem, self.filter, search=not user_id).grid(row=0, column=0, sticky='nw', padx=5, pady=5)
+        # Creates a table keeping only the visible rows
+        self.table = VirtualTable(frame, rem, lambda: count_records(self.query), self.fetch, fields, 1, 0,
+                                  sorter=self.sort)
+
+        # Creates a button for main window
+        ok = Button(frame, bg=st.colours['bg'],
+                    bd=1, fg=st.colours['fg_enter'], font=st.get_font_size(rem, 3),
+                    text='Ok', command=self.hide,
+                    activeforeground='black', activebackground=st.colours['fg'], width=10)
+        ok.place(relx=0.5, rely=0.96, anchor='s')
+
+    def show(self, user_id=None):
+        """Fills the table with the current records of the user or all records and shows the window"""
+        self.user_id = user_id
+        self.refresh()
+        self.master.deiconify()
+        self.master.lift()
+
+    def fetch(self, after, offset, limit):
+        """Returns a page of the records, after the last row of the previous page if it's given"""
+        return page_records(self.query, limit, offset, after, self.order, self.descending)
+
+    def sort(self, column, descending):
+        """Sorts by the column of the table, the table reloads itself"""
+        self.order, self.descending = self.keys[column], descending
+        self.query = self.build_query()
+
+    def filter(self, level, search):
+        """Keeps the records of the level and of the users found by the search"""
+        self.level, self.search = level, search
+        self.refresh()
+
+    def build_query(self):
+        """Returns the query of the current choices"""
+        return record_query(self.user_id, self.order, self.descending, self.level, self.search)
+
+    def refresh(self):
+        """Builds the query of the current choices and shows the first rows"""
+        self.query = self.build_query()
+        self.table.reload()
+
+    def hide(self):
+        """Hides the window, it's shown again by the next show()"""
+        self.master.withdraw()
+
+
+# Records windows built so far, one for all records and one for the records of a user
+windows = {}
+
+
+def all_time_records(rem, user_id=None, master=None):
+    """Shows the records window, built on first use and reused after"""
+    key = 'user' if user_id else 'all'
+    if key not in windows:
+        windows[key] = RecordWindow(rem, user_id, master)
+    windows[key].show(user_id)
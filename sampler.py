@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+# for the new permutation seeds
+from random import Random, getrandbits
+# draws may come from the prefetch worker and the Tk thread
+from threading import Lock
+
+import secret_word
+
+
+"""
+Degree:         Faculty of Creative Arts, Technologies and Science
+Department:     Computer Science and Technology
+University:     University of Bedfordshire
+Author:         Oszkar Feher
+Date:           21 October 2022
+"""
+
+
+class ShuffleBag:
+    """ShuffleBag class, walks a random permutation of the word numbers 0 .. size - 1.
+    The permutation is never stored, it's generated from the seed by a small Feistel network,
+    so the whole state is the seed and the cursor and every draw is O(1).
+    No number repeats until all of them are drawn, than a new seed starts a new round.
+    :methods: - permute(number) -> int: - position of the number in the permutation;
+              - draw() -> int: - next word number;
+    """
+    # Rounds of the Feistel network
+    rounds = 4
+
+    def __init__(self, size, seed=None, cursor=0):
+        """
+        Constructor.
+        :param size: - number of words in the bag, at least one.
+        :param seed: - permutation seed, random if not given.
+        :param cursor: - count of numbers already drawn from the permutation.
+        """
+        # the cycle walking of an empty bag would never find a number
+        if size < 1:
+            raise IndexError('no words to draw from')
+        self.size = size
+        self.cursor = cursor
+        # bits of one Feistel half, the network covers 4 ** half >= size numbers
+        self.half = max(1, ((size - 1).bit_length() + 1) // 2)
+        self.mask = (1 << self.half) - 1
+        self.reseed(getrandbits(32) if seed is None else seed)
+
+    def reseed(self, seed):
+        """Sets the permutation seed and the round keys"""
+        self.seed = seed
+        rand = Random(seed)
+        self.keys = [rand.getrandbits(32) for _ in range(self.rounds)]
+
+    def permute(self, number):
+        """Returns the number at the given position of the permutation"""
+        while True:
+            left, right = number >> self.half, number & self.mask
+            for key in self.keys:
+                mixed = ((right ^ key) * 0x9E3779B1 + key) & 0xFFFFFFFF
+                left, right = right, left ^ ((mixed ^ (mixed >> 15)) & self.mask)
+            number = (left << self.half) | right
+            # cycle walking: numbers outside the bag are permuted again
+            if number < self.size:
+                return number
+
+    def draw(self):
+        """Returns the next word number, starting a new round if the bag is empty"""
+        if self.cursor >= self.size:
+            self.reseed(getrandbits(32))
+            self.cursor = 0
+        number = self.permute(self.cursor)
+        self.cursor += 1
+        return number
+
+
+class WordSampler:
+    """WordSampler class, hands out words without repeats per category, level and user.
+    One ShuffleBag is kept per (user, category, level) over the word numbers of the level,
+    its seed and cursor are saved through the save callable and restored through the load
+    callable for logged in users.
+    :methods: - numbers(category, level) -> sequence: - word numbers to draw from;
+              - bag(category, level, user_id) -> ShuffleBag: - returns the bag of a user category;
+              - draw(category, user_id, level) -> str: - returns the next word of the category;
+    """
+    def __init__(self, index=None, load=None, save=None):
+        """
+        Constructor.
+        :param index: - word index with count(), word() and level() methods, by default secret_word.index.
+        :param load: - callable(user_id, category, level) -> (seed, cursor, size) or None.
+        :param save: - callable(user_id, category, level, seed, cursor, size).
+        """
+        self.index = index or secret_word.index
+        self.load = load
+        self.save = save
+        # (user id, category, level) -> ShuffleBag
+        self.bags = {}
+        # one draw at a time, so a cursor is never advanced twice for the same number
+        self.lock = Lock()
+
+    def numbers(self, category, level):
+        """Returns the word numbers of the level, all words if no level or the level it's empty"""
+        numbers = self.index.level(category, level) if level else None
+        return numbers if numbers else range(self.index.count(category))
+
+    def bag(self, category, level=0, user_id=None):
+        """Returns the bag of the category level, restored from the saved cursor for a user"""
+        key = (user_id, category, level)
+        size = len(self.numbers(category, level))
+        if not size:
+            raise IndexError(f'{category} has no words')
+        bag = self.bags.get(key)
+        if bag is None or bag.size != size:
+            state = self.load(user_id, category, level) if user_id and self.load else None
+            # a saved cursor it's used only if the category size didn't change since
+            if state and state[2] == size:
+                bag = ShuffleBag(size, state[0], state[1])
+            else:
+                bag = ShuffleBag(size)
+            self.bags[key] = bag
+        return bag
+
+    def draw(self, category, user_id=None, level=0):
+        """Returns the next word of the category and level, random category if 'random'"""
+        category = secret_word.resolve(category, self.index)
+        with self.lock:
+            # edited word lists are swapped in here, between two draws
+            self.index.refresh(category)
+            # a streamed category it's not held in memory, its words can't be shuffled
+            if self.index.streamed(category):
+                return self.index.pick(category, level)
+            bag = self.bag(category, level, user_id)
+            word = self.index.word(category, self.numbers(category, level)[bag.draw()])
+            if user_id and self.save:
+                self.save(user_id, category, level, bag.seed, bag.cursor, bag.size)
+        return word
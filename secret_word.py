@@ -1,7 +1,25 @@
 #!/usr/bin/env python3
 
-from random import choice
+from random import choice, randrange
 from csv import reader
+# for the letter rarity of the difficulty score
+from collections import Counter
+from math import log
+# compact word number lists of the difficulty levels
+from array import array
+# for reading the compiled corpus without parsing it
+from mmap import mmap, ACCESS_READ
+from os import stat
+from os.path import exists, getsize, basename, splitext
+from glob import glob
+from struct import Struct
+# the compiled tables are little endian
+from sys import byteorder
+# for the warnings, stdout it's left to the JSON reports of the tools
+from sys import stderr
+# for rebuilding edited categories in the background
+from threading import Thread
+from time import monotonic
 
 
 """
@@ -12,25 +30,411 @@ Author:         Oszkar Feher
 Date:           21 October 2022
 """
 
+# Folder of the word lists, one csv file per category
+WORDS_DIR = 'WORDS'
 
-def get_word(search_query):
-    """Open the selected csv file and returns a random word"""
-    # from csv import DictReader, DictWriter, reader, writer
-    categories = ['animal', 'plant', 'object', 'geography',
-                  'invention', 'history', 'sport']
-    query = search_query
-    if search_query == "random":
-        query = choice(categories)
-    try:
-        with open(f'WORDS/{query}.csv', 'r') as file:
-            raw_words = reader(file)
-            words = []
-            for item in raw_words:
-                words.append(item[0].lower())
-            word = choice(words)
-        return word
-
-    except FileNotFoundError as err:
-        print(err)
-        word = get_word('random')
-        return word
+# Csv files bigger than this (bytes) are not loaded, a word is streamed from the file instead
+STREAM_THRESHOLD = 64 * 1024 * 1024
+# Streaming mode: 'reservoir' - uniform pick in one pass,
+#                 'seek' - jump to a random byte and take the next line, faster but longer lines are favoured
+STREAM_MODE = 'reservoir'
+
+# Seconds between two checks of a loaded csv file for changes
+RELOAD_INTERVAL = 2.0
+
+# Compiled corpus file inside WORDS_DIR, built by compile_words.py
+CORPUS_FILE = 'words.bin'
+CORPUS_MAGIC = b'GLWC'
+CORPUS_VERSION = 2
+# magic, version, category count
+HEADER = Struct('<4sHH')
+# category name, word count, offset table position, word data position,
+# easy, medium, hard word counts, level tables position
+ENTRY = Struct('<32sIQQ3IQ')
+# one entry of an offset table, also one word number of a level table
+OFFSET = Struct('<I')
+# start and end offset of a word in the category word data, two neighbour offset table entries
+OFFSETS = Struct('<II')
+
+
+def score(word, rarity):
+    """
+    Difficulty score of a word, the higher the harder.
+    :param word: - lower case word.
+    :param rarity: - dictionary of letter and its rarity in the category.
+    :return: - float, longer words with more and rarer distinct letters score higher,
+               letters revealed by the first and last letters on easy level lower it.
+               The letters are summed in alphabetical order, so the score doesn't depend on
+               the set order and every process ranks the words the same.
+    """
+    letters = set(word) - {' ', '-'}
+    length = len(word) - word.count(' ') - word.count('-')
+    revealed = sum(1 for x in word if x == word[0] or x == word[-1])
+    return 0.5 * length + len(letters) + sum(rarity[x] for x in sorted(letters)) - revealed
+
+
+def rank_levels(words):
+    """
+    Scores every word once and splits the word numbers into the difficulty levels.
+    :param words: - sequence of lower case words of one category.
+    :return: - tuple of easy, medium and hard arrays of word numbers.
+    """
+    # letter rarity: negative log of the letter frequency in the category
+    counts = Counter(x for word in words for x in word)
+    total = sum(counts.values()) or 1
+    rarity = {x: -log(n / total) for x, n in counts.items()}
+    ranked = sorted(range(len(words)), key=lambda i: score(words[i], rarity))
+    size = len(ranked)
+    return tuple(array('I', ranked[size * i // 3:size * (i + 1) // 3]) for i in range(3))
+
+
+def level_table(view):
+    """Word numbers of a little endian level table of the mapped corpus.
+    On a little endian host it's a view of the mapped file, otherwise a byte swapped copy."""
+    if byteorder == 'little':
+        return view.cast('I')
+    numbers = array('I', view.tobytes())
+    numbers.byteswap()
+    return numbers
+
+
+def has_word(path):
+    """True if the csv file has at least one word, the file it's read only till the first word"""
+    with open(path, 'r') as file:
+        return any(item for item in reader(file))
+
+
+def reservoir_word(path):
+    """Uniformly random word of a csv file in one pass (reservoir sampling), constant memory"""
+    word = None
+    with open(path, 'r') as file:
+        rows = (item for item in reader(file) if item)
+        for number, item in enumerate(rows, 1):
+            # the n-th word replaces the kept one with 1/n probability
+            if randrange(number) == 0:
+                word = item[0]
+    if word is None:
+        raise IndexError(f'{path} has no words')
+    return word.lower()
+
+
+def seek_word(path):
+    """Random word of a csv file by jumping to a random byte and reading the next whole line"""
+    size = getsize(path)
+    with open(path, 'rb') as file:
+        # a few tries in case of empty lines
+        for _ in range(32):
+            file.seek(randrange(size) if size else 0)
+            # the rest of the line it's skipped, it may be only a part of a word
+            file.readline()
+            line = file.readline()
+            if not line:
+                # after the last line it's continued from the first one
+                file.seek(0)
+                line = file.readline()
+            row = next(reader([line.decode('utf-8')]), None)
+            if row and row[0]:
+                return row[0].lower()
+    raise IndexError(f'{path} has no words')
+
+
+class WordIndex:
+    """WordIndex class, keeps every category word list in memory.
+    Each category file is read only once, on first use, and stored as a tuple
+    so a random pick is a single index with no file access.
+    The words are ranked into the difficulty levels only when a level of the category is first asked for.
+    Files bigger than STREAM_THRESHOLD are never loaded, their words are streamed.
+    Edited files are picked up without a restart: refresh() compares the file modification time
+    and size with the loaded ones, rebuilds only the changed category on a worker thread
+    and swaps the rebuilt words and levels in together on the next refresh.
+    An emptied file keeps its last words, a game never draws from an empty category.
+    :methods: - manifest() -> dict: - word count of every category with a word, None till it's loaded;
+              - counted(category, entry): - keeps the word count of a loaded category in the manifest;
+              - streamed(category) -> bool: - True if the category it's too big to be loaded;
+              - build(category) -> list: - reads a category file, returns stamp, words and no levels yet;
+              - refresh(category): - swaps in a rebuilt category, starts a rebuild if the file changed;
+              - reload(category): - worker thread rebuilding a changed category;
+              - load(category) -> tuple: - reads (once) and returns the words of a category;
+              - stamp(category) -> tuple: - file modification time and size of the loaded words;
+              - count(category) -> int: - number of words in the category;
+              - word(category, number) -> str: - word by its position in the category;
+              - level(category, level) -> array: - word numbers of the difficulty level, ranked on first use;
+              - pick(category, level) -> str: - returns a random word from the category;
+    """
+    def __init__(self, path=WORDS_DIR, threshold=STREAM_THRESHOLD, mode=STREAM_MODE,
+                 interval=RELOAD_INTERVAL):
+        """Constructor"""
+        # folder of the csv files
+        self.path = path
+        # file size limit of loading and the streaming mode above it
+        self.threshold = threshold
+        self.stream = seek_word if mode == 'seek' else reservoir_word
+        # seconds between two change checks of a category file
+        self.interval = interval
+        # category name -> [(modification time, size), tuple of words,
+        #                  easy, medium and hard word numbers or None until a level is asked for]
+        self.entries = {}
+        # category name -> rebuilt entry waiting to be swapped in, None if it's to be streamed now
+        self.pending = {}
+        # categories being rebuilt
+        self.reloading = set()
+        # category name -> time of the last change check
+        self.checked = {}
+        # category name -> word count of the categories with a word, found on first use
+        self.counts = None
+
+    def manifest(self):
+        """Returns the word count of every category file of the folder with at least one word, found only once.
+        A file it's read only till its first word, so big files are not loaded.
+        The count of a category it's None till its words are loaded, a streamed category it's never counted."""
+        if self.counts is None:
+            counts = {}
+            for path in sorted(glob(f'{self.path}/*.csv')):
+                try:
+                    found = has_word(path)
+                except (OSError, UnicodeDecodeError) as err:
+                    print(err, file=stderr)
+                    continue
+                if found:
+                    counts[splitext(basename(path))[0]] = None
+                else:
+                    print(f'{path} has no words, category skipped', file=stderr)
+            self.counts = counts
+            for category, entry in self.entries.items():
+                self.counted(category, entry)
+        return self.counts
+
+    def counted(self, category, entry):
+        """Keeps the word count of the loaded category in the manifest, None for a streamed category"""
+        if self.counts is not None and category in self.counts:
+            self.counts[category] = len(entry[1]) if entry else None
+
+    def streamed(self, category):
+        """True if the category file it's too big to be loaded"""
+        return category not in self.entries and getsize(f'{self.path}/{category}.csv') > self.threshold
+
+    def build(self, category):
+        """Reads the category file, returns its stamp and words, the levels are ranked by level()"""
+        path = f'{self.path}/{category}.csv'
+        # the stamp it's taken first, an edit during reading will be seen by the next check
+        info = stat(path)
+        with open(path, 'r') as file:
+            words = tuple(item[0].lower() for item in reader(file) if item)
+        return [(info.st_mtime_ns, info.st_size), words, None]
+
+    def refresh(self, category):
+        """Swaps in the rebuilt category if ready and checks the file for changes.
+        Called before a pick, so count, word and level always read the same words."""
+        if category in self.pending:
+            entry = self.pending.pop(category)
+            if entry is None:
+                self.entries.pop(category, None)
+            else:
+                self.entries[category] = entry
+            self.counted(category, entry)
+        entry = self.entries.get(category)
+        now = monotonic()
+        if entry is None or category in self.reloading or now - self.checked.get(category, 0) < self.interval:
+            return
+        self.checked[category] = now
+        try:
+            info = stat(f'{self.path}/{category}.csv')
+        except FileNotFoundError:
+            # a removed file keeps its last words
+            return
+        if (info.st_mtime_ns, info.st_size) != entry[0]:
+            self.reloading.add(category)
+            Thread(target=self.reload, args=(category,), daemon=True).start()
+
+    def reload(self, category):
+        """Worker thread, rebuilds a changed category, unchanged categories are not read"""
+        try:
+            if getsize(f'{self.path}/{category}.csv') > self.threshold:
+                self.pending[category] = None
+            else:
+                entry = self.build(category)
+                if not entry[1]:
+                    # an emptied file keeps the last words, its new stamp stops rereading it until edited again
+                    print(f'{category}.csv has no words, the last words are kept', file=stderr)
+                    old = self.entries[category]
+                    entry = [entry[0], old[1], old[2]]
+                self.pending[category] = entry
+        except (OSError, UnicodeDecodeError) as err:
+            # the old words are kept, the next check will try again
+            print(err, file=stderr)
+        finally:
+            self.reloading.discard(category)
+
+    def load(self, category):
+        """Returns the words of the category, the csv file it's parsed only on first use"""
+        entry = self.entries.get(category)
+        if entry is None:
+            entry = self.entries[category] = self.build(category)
+            self.counted(category, entry)
+        return entry[1]
+
+    def stamp(self, category):
+        """Modification time and size of the file the loaded words were read from,
+        a rebuild not yet swapped in doesn't change it"""
+        self.load(category)
+        return self.entries[category][0]
+
+    def count(self, category):
+        """Number of words in the category"""
+        return len(self.load(category))
+
+    def word(self, category, number):
+        """Returns the word by its position in the category"""
+        return self.load(category)[number]
+
+    def level(self, category, level):
+        """Returns the word numbers of the difficulty level, level 1 - 3.
+        Every word of the category it's scored once, when a level is first asked for."""
+        self.load(category)
+        entry = self.entries[category]
+        if entry[2] is None:
+            entry[2] = rank_levels(entry[1])
+        return entry[2][level - 1]
+
+    def pick(self, category, level=None):
+        """Returns a random word from the category, from the difficulty level if given.
+        A streamed category has no difficulty levels, the level it's ignored."""
+        self.refresh(category)
+        if self.streamed(category):
+            return self.stream(f'{self.path}/{category}.csv')
+        return pick_word(self, category, level)
+
+
+class Corpus:
+    """Corpus class, reader of the binary corpus compiled by compile_words.py.
+    The file is memory mapped, so processes on the same host share one copy in the page cache.
+    A word is sliced out by its offsets only when picked, no word objects are kept.
+    The difficulty levels are precomputed by the compiler as word number tables.
+    :methods: - manifest() -> dict: - word count of every category of the corpus with words;
+              - streamed(category) -> bool: - always False, the mapped file it's never loaded;
+              - refresh(category): - nothing to do, the compiled file changes only by compile_words.py;
+              - stamp(category) -> tuple: - modification time and size of the corpus file;
+              - count(category) -> int: - number of words in the category;
+              - word(category, number) -> str: - word by its position in the category;
+              - level(category, level) -> memoryview or array: - word numbers of the difficulty level;
+              - pick(category, level) -> str: - returns a random word from the category;
+    """
+    def __init__(self, path):
+        """Constructor, maps the file and reads the category table"""
+        with open(path, 'rb') as file:
+            self.data = mmap(file.fileno(), 0, access=ACCESS_READ)
+            info = stat(file.fileno())
+        # modification time and size of the mapped file
+        self.file_stamp = (info.st_mtime_ns, info.st_size)
+        magic, version, total = HEADER.unpack_from(self.data)
+        if magic != CORPUS_MAGIC or version != CORPUS_VERSION:
+            raise ValueError(f'{path} is not a word corpus version {CORPUS_VERSION}')
+        # category name -> (word count, offset table position, word data position)
+        self.categories = {}
+        # category name -> easy, medium and hard word numbers, views of the mapped file on little endian hosts
+        self.levels = {}
+        view = memoryview(self.data)
+        for i in range(total):
+            name, count, table, start, *sizes, position = ENTRY.unpack_from(
+                self.data, HEADER.size + ENTRY.size * i)
+            name = name.rstrip(b'\0').decode('utf-8')
+            self.categories[name] = (count, table, start)
+            levels = []
+            for size in sizes:
+                levels.append(level_table(view[position:position + OFFSET.size * size]))
+                position += OFFSET.size * size
+            self.levels[name] = tuple(levels)
+
+    def manifest(self):
+        """Returns the word count of every category with words, read from the category table"""
+        return {name: entry[0] for name, entry in self.categories.items() if entry[0]}
+
+    @staticmethod
+    def streamed(category):
+        """The mapped corpus never holds words in memory, so nothing has to be streamed"""
+        return False
+
+    @staticmethod
+    def refresh(category):
+        """The compiled corpus it's rebuilt offline, run compile_words.py and restart"""
+        pass
+
+    def entry(self, category):
+        """Returns the category table entry, missing category behaves like a missing csv file"""
+        try:
+            return self.categories[category]
+        except KeyError:
+            raise FileNotFoundError(f'No category {category!r} in the word corpus')
+
+    def stamp(self, category):
+        """Modification time and size of the mapped corpus file, every category it's read from it"""
+        self.entry(category)
+        return self.file_stamp
+
+    def count(self, category):
+        """Number of words in the category"""
+        return self.entry(category)[0]
+
+    def word(self, category, number):
+        """Returns the word by its position in the category"""
+        count, table, start = self.entry(category)
+        if not 0 <= number < count:
+            raise IndexError('word number out of range')
+        begin, end = OFFSETS.unpack_from(self.data, table + OFFSET.size * number)
+        return self.data[start + begin:start + end].decode('utf-8')
+
+    def level(self, category, level):
+        """Returns the word numbers of the difficulty level, level 1 - 3"""
+        self.entry(category)
+        return self.levels[category][level - 1]
+
+    def pick(self, category, level=None):
+        """Returns a random word from the category, from the difficulty level if given"""
+        return pick_word(self, category, level)
+
+
+def pick_word(words, category, level=None):
+    """Random word of the category from the word index,
+    from the difficulty level if given and not empty"""
+    count = words.count(category)
+    if not count:
+        raise IndexError(f'{category} has no words')
+    numbers = words.level(category, level) if level else None
+    if numbers:
+        return words.word(category, numbers[randrange(len(numbers))])
+    return words.word(category, randrange(count))
+
+
+def open_index(path=WORDS_DIR):
+    """Returns the compiled corpus if it exists, otherwise the csv based word index"""
+    if exists(f'{path}/{CORPUS_FILE}'):
+        return Corpus(f'{path}/{CORPUS_FILE}')
+    return WordIndex(path)
+
+
+def resolve(category, words=None):
+    """
+    Returns the category to draw from.
+    :param category: - selected category or 'random'.
+    :param words: - word index, by default the process wide index.
+    :return: - the category if it's in the manifest, otherwise a random category of the manifest,
+               so no missing or empty file it's ever opened.
+    """
+    available = (words or index).manifest()
+    if category in available:
+        return category
+    if not available:
+        raise FileNotFoundError(f'No word lists found in {WORDS_DIR}/')
+    return choice(list(available))
+
+
+# Process wide word index shared by every game
+index = open_index()
+# Category manifest of the words folder, built once at startup reading every file only till its first word
+manifest = index.manifest()
+
+
+def get_word(search_query, level=None):
+    """Returns a random word of the selected category and difficulty level from the word index.
+    Random or unavailable category it's drawn from the categories of the manifest."""
+    return index.pick(resolve(search_query), level)
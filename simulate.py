@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+
+# for command line arguments
+import argparse
+# for the machine readable report
+import json
+import sys
+# for running the games on every core
+from multiprocessing import Pool, cpu_count
+# for the random strategy and the per task seeds
+import random
+from time import perf_counter
+
+import secret_word
+from sampler import WordSampler
+from game_session import GameSession
+from game_state import ALPHABET, int_to_levels
+
+
+"""
+Headless batch simulation of the game, for tuning the word lists and the difficulty levels
+and for generating load data of the record database.
+Plays the given number of games at every difficulty level of every category with a strategy,
+the games are split into chunks played by a multiprocessing pool on all cores.
+The report it's written as JSON: win rates, guess and miss distributions and throughput,
+per level and category and in total.
+Strategies:
+    random - any letter not yet guessed.
+    frequency - the letters in English letter frequency order.
+    solver - the suggestion of the Solver, the letter in the most fitting words.
+Use:
+    python simulate.py [--games 1000] [--strategy solver] [--processes 4] [--output report.json]
+                       [--record USERNAME]
+
+Degree:         Faculty of Creative Arts, Technologies and Science
+Department:     Computer Science and Technology
+University:     University of Bedfordshire
+Author:         Oszkar Feher
+Date:           21 October 2022
+"""
+
+# Letters of English text from the most to the least frequent
+FREQUENCY_ORDER = 'ETAOINSHRDLCUMWFGYPBVKJXQZ'
+# Games played by one pool task
+CHUNK = 250
+
+
+def unused(state):
+    """Returns the letters not yet guessed and not shown from the start"""
+    used = state.guessed | state.missed | state.revealed
+    return [x for i, x in enumerate(ALPHABET) if not used >> i & 1]
+
+
+def random_strategy():
+    """Returns a strategy guessing any letter not yet guessed"""
+    def strategy(session):
+        return random.choice(unused(session.state))
+    return strategy
+
+
+def frequency_strategy():
+    """Returns a strategy guessing the letters in English frequency order"""
+    def strategy(session):
+        left = set(unused(session.state))
+        return next(x for x in FREQUENCY_ORDER if x in left)
+    return strategy
+
+
+def solver_strategy():
+    """Returns a strategy guessing the suggestion of the Solver"""
+    # imported here, the other strategies don't need NumPy
+    from solver import Solver
+    solver = Solver()
+
+    def strategy(session):
+        return solver.hint(session)
+    return strategy
+
+
+# Strategy name -> factory of a callable(session) -> letter, a new strategy only has to be added here
+STRATEGIES = {'random': random_strategy, 'frequency': frequency_strategy, 'solver': solver_strategy}
+
+# Strategies made in this process, made once per process and reused by its tasks
+made = {}
+
+
+def play(task):
+    """
+    Plays one chunk of games, runs in a pool process.
+    :param task: - tuple of strategy name, category, level integer, number of games, seed
+                   and True if the won games are kept for the records.
+    :return: - dictionary of the chunk results.
+    """
+    name, category, level, games, seed, keep = task
+    # forked processes start with the same random state, every chunk it's seeded on its own
+    random.seed(seed)
+    if name not in made:
+        made[name] = STRATEGIES[name]()
+    strategy = made[name]
+    session = GameSession(WordSampler())
+    won, guesses, misses, kept = 0, {}, {}, []
+    start = perf_counter()
+    for _ in range(games):
+        session.start(category, level)
+        while session.running:
+            letter = strategy(session)
+            if letter is None:
+                break
+            session.guess(letter)
+        state = session.state
+        if session.result == 'won':
+            won += 1
+            if keep:
+                kept.append((level, state.guesses, state.misses))
+        guesses[state.guesses] = guesses.get(state.guesses, 0) + 1
+        misses[state.misses] = misses.get(state.misses, 0) + 1
+        session.stop()
+    return {'category': category, 'level': level, 'games': games, 'won': won,
+            'guesses': guesses, 'misses': misses, 'seconds': perf_counter() - start, 'kept': kept}
+
+
+def tasks(strategy, categories, games, seed=0, keep=False):
+    """Returns the pool tasks, every level and category split into chunks of CHUNK games"""
+    result = []
+    for level in int_to_levels:
+        for category in categories:
+            for start in range(0, games, CHUNK):
+                result.append((strategy, category, level, min(CHUNK, games - start),
+                               seed + len(result), keep))
+    return result
+
+
+def merge(total, part):
+    """Adds the counts of a chunk result to the total"""
+    total['games'] += part['games']
+    total['won'] += part['won']
+    total['seconds'] += part['seconds']
+    for key in ('guesses', 'misses'):
+        for number, times in part[key].items():
+            total[key][number] = total[key].get(number, 0) + times
+
+
+def summary(total):
+    """Returns the report entry of merged results"""
+    games = total['games'] or 1
+    return {'games': total['games'], 'won': total['won'],
+            'win_rate': round(total['won'] / games, 4),
+            'guesses': {str(k): total['guesses'][k] for k in sorted(total['guesses'])},
+            'misses': {str(k): total['misses'][k] for k in sorted(total['misses'])},
+            'mean_guesses': round(sum(k * v for k, v in total['guesses'].items()) / games, 3),
+            'mean_misses': round(sum(k * v for k, v in total['misses'].items()) / games, 3)}
+
+
+def empty():
+    """Returns a new result total"""
+    return {'games': 0, 'won': 0, 'seconds': 0.0, 'guesses': {}, 'misses': {}}
+
+
+def record_rows(username, parts):
+    """Returns the record rows of the kept won games, for the given user"""
+    # imported here, the simulation itself doesn't touch the database
+    from record import user
+    found = user(username).first()
+    if not found:
+        raise SystemExit(f'No user {username}')
+    return [(found.id, level, False, guesses, misses)
+            for part in parts for level, guesses, misses in part['kept']]
+
+
+def main(argv=None):
+    """Command line entry, prints or writes the JSON report"""
+    parser = argparse.ArgumentParser(description='Batch game simulation')
+    parser.add_argument('--games', type=int, default=1000, help='games per level and category')
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='solver')
+    parser.add_argument('--categories', help='comma separated categories of the found word lists, all if not given')
+    parser.add_argument('--processes', type=int, default=cpu_count(), help='pool size')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='report file, printed if not given')
+    parser.add_argument('--record', metavar='USERNAME',
+                        help='bulk insert the won games into GameRecord for the user')
+    args = parser.parse_args(argv)
+
+    categories = args.categories.split(',') if args.categories else list(secret_word.manifest)
+    # an unknown category would be replaced by a random one and its games reported under the wrong name
+    unknown = [category for category in categories if category not in secret_word.manifest]
+    if unknown:
+        parser.error(f'no words for {", ".join(unknown)}, found: {", ".join(secret_word.manifest)}')
+    start = perf_counter()
+    with Pool(args.processes) as pool:
+        parts = pool.map(play, tasks(args.strategy, categories, args.games, args.seed,
+                                         bool(args.record)))
+    seconds = perf_counter() - start
+
+    overall, grouped = empty(), {}
+    for part in parts:
+        merge(overall, part)
+        merge(grouped.setdefault((part['level'], part['category']), empty()), part)
+    report = {'strategy': args.strategy, 'processes': args.processes,
+              'seconds': round(seconds, 3),
+              'games_per_s': round(overall['games'] / (seconds or 1e-9), 1),
+              'games_per_s_per_process': round(overall['games'] / (overall['seconds'] or 1e-9), 1),
+              'total': summary(overall), 'results': []}
+    for (level, category), total in sorted(grouped.items()):
+        entry = {'level': int_to_levels[level], 'category': category}
+        entry.update(summary(total))
+        report['results'].append(entry)
+
+    if args.record:
+        from record import insert_records
+        report['recorded'] = insert_records(record_rows(args.record, parts))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+# for the vectorized candidate filter
+import numpy as np
+
+import secret_word
+from game_state import ALPHABET, letters
+
+
+"""
+Letter suggestion solver, used for hints and auto play.
+The words of a category are encoded once into a NumPy matrix of character codes,
+a suggestion filters the whole matrix with array operations, no word is checked one by one.
+
+Degree:         Faculty of Creative Arts, Technologies and Science
+Department:     Computer Science and Technology
+University:     University of Bedfordshire
+Author:         Oszkar Feher
+Date:           21 October 2022
+"""
+
+# Character codes of the letters
+CODES = np.frombuffer(ALPHABET.encode('ascii'), dtype=np.uint8)
+
+
+class Solver:
+    """Solver class, suggests the letter most likely to be in the secret word.
+    :methods: - encode(category) -> tuple: - character code matrix and word lengths of a category;
+              - candidates(category, pattern, missed) -> ndarray: - word numbers still fitting;
+              - suggest(category, pattern, missed) -> str: - letter in the most candidate words;
+              - hint(session) -> str: - suggestion for a running GameSession;
+              - auto_play(session) -> str: - plays the running game till the end, returns the result;
+    """
+    def __init__(self, index=None, patterns=None):
+        """
+        Constructor.
+        :param index: - word index with count() and word() methods, by default secret_word.index.
+        :param patterns: - optional PatternIndex, the candidates are looked up in it instead of filtered.
+        """
+        self.index = index or secret_word.index
+        self.patterns = patterns
+        # category name -> (character code matrix, word lengths)
+        self.encoded = {}
+
+    def encode(self, category):
+        """Returns the upper case words of the category as a zero padded uint8 matrix and their lengths"""
+        if category not in self.encoded:
+            words = [self.index.word(category, i).upper().encode('ascii', 'replace')
+                     for i in range(self.index.count(category))]
+            width = max(map(len, words), default=1)
+            matrix = np.array(words, dtype=f'S{width}').view(np.uint8).reshape(len(words), width)
+            lengths = np.fromiter(map(len, words), dtype=np.int32, count=len(words))
+            self.encoded[category] = matrix, lengths
+        return self.encoded[category]
+
+    def candidates(self, category, pattern, missed=''):
+        """
+        Filters the words of the category.
+        :param category: - category of the secret word.
+        :param pattern: - displayed word characters, '_' for a hidden letter.
+        :param missed: - letters guessed wrong.
+        :return: - array of the word numbers fitting the pattern and containing no missed letter.
+        """
+        if self.patterns:
+            return self.patterns.candidates(category, pattern, missed).astype(np.intp)
+        matrix, lengths = self.encode(category)
+        size = len(pattern)
+        if size > matrix.shape[1]:
+            return np.empty(0, dtype=np.intp)
+        # only the words of the same length are compared
+        numbers = np.flatnonzero(lengths == size)
+        rows = matrix[numbers, :size]
+        codes = np.frombuffer(pattern.encode('ascii', 'replace'), dtype=np.uint8)
+        hidden = codes == ord('_')
+        # shown characters must be the same
+        fits = (rows[:, ~hidden] == codes[~hidden]).all(axis=1)
+        # a hidden position can't be a shown letter (all its positions would be shown) or a missed letter
+        excluded = np.zeros(256, dtype=bool)
+        excluded[codes[~hidden]] = True
+        excluded[np.frombuffer(missed.encode('ascii', 'replace'), dtype=np.uint8)] = True
+        fits &= ~excluded[rows[:, hidden]].any(axis=1)
+        return numbers[fits]
+
+    def suggest(self, category, pattern, missed=''):
+        """Returns the not yet guessed letter found in the most candidate words, None if no letter left"""
+        numbers = self.candidates(category, pattern, missed)
+        matrix = self.encode(category)[0]
+        codes = np.frombuffer(pattern.encode('ascii', 'replace'), dtype=np.uint8)
+        hidden = codes == ord('_')
+        if len(numbers):
+            chars = matrix[numbers][:, :len(pattern)][:, hidden]
+        else:
+            # no word fits, the letter frequency of the whole category it's used
+            chars = matrix
+        # number of words containing each letter, every word counts a letter once
+        counts = np.array([(chars == code).any(axis=1).sum() for code in CODES])
+        # letters already shown or missed are not suggested
+        guessed = set(pattern) | set(missed)
+        for i, x in enumerate(ALPHABET):
+            if x in guessed:
+                counts[i] = -1
+        best = int(counts.argmax())
+        return ALPHABET[best] if counts[best] >= 0 else None
+
+    def hint(self, session):
+        """Returns the suggested letter of a running GameSession"""
+        state = session.state
+        return self.suggest(session.category, ''.join(state.buffer), ''.join(letters(state.missed)))
+
+    def auto_play(self, session):
+        """Guesses the suggested letters till the game of the session ends, returns the result"""
+        while session.running:
+            letter = self.hint(session)
+            if letter is None:
+                break
+            session.guess(letter)
+        return session.result
@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 
+# for the fetched pages of the virtual table
+from collections import OrderedDict
 # Graphical elements to create a table style
-from tkinter.ttk import Treeview, Style, Scrollbar
+from tkinter.ttk import Treeview, Style, Scrollbar, Combobox
+# Graphical elements of the filter bar
+from tkinter import Frame, Label, Entry, Button
 
 import variables as var
 
@@ -14,10 +18,24 @@ Author:         Oszkar Feher
 Date:           21 October 2022
 """
 
+# Rows fetched from the database at once by the virtual table
+PAGE_SIZE = 100
+# Fetched pages kept by the virtual table, the least recently used are dropped first
+PAGES_KEPT = 5
+
+
+def values(row_):
+    """Returns the displayed values of a database row"""
+    return tuple(str(i).strip("\'") for i in row_)
+
 
 class Table:
-    """Table class used to display a table with database rows."""
-    def __init__(self, root, rem, data: list, fields: list, row: int, column: int):
+    """Table class used to display a table with database rows.
+    :methods: - build(root, rem, fields, row, column): - creates the treeview, its scroll bar and headings;
+              - fill(data): - inserts every row;
+              - sort_by(column): - heading click event, sorts by the column, again for the opposite order;
+    """
+    def __init__(self, root, rem, data: list, fields: list, row: int, column: int, sorter=None):
         """
         Constructor.
         :param root: - the frame where it will be displayed the table.
@@ -26,8 +44,22 @@ class Table:
         :param fields: - columns name.
         :param row: - row count.
         :param column: - column count.
+        :param sorter: - callable(column, descending), headings are clickable if given.
         """
-        col, height = tuple([i for i in range(len(fields))]), 20
+        # visible rows of the table
+        self.height = 20
+        # column names, callable(column, descending) sorting the rows if the headings are clickable
+        self.fields = fields
+        self.sorter = sorter
+        # sorted column and order
+        self.sorted, self.descending = None, False
+        self.build(root, rem, fields, row, column)
+        # Populating the table with database rows
+        self.fill(data)
+
+    def build(self, root, rem, fields, row, column):
+        """Creates the treeview, its scroll bar and headings"""
+        col = tuple([i for i in range(len(fields))])
         # Style for the treeview
         self.style = Style()
         # Modify the font of the body
@@ -39,7 +71,7 @@ class Table:
         self.style.layout("Treeview", [('Treeview.treearea', {'sticky': 'news'})])
         # Creating the Table
         self.table = Treeview(root, column=col,
-                              height=height, show='headings', style='Treeview')
+                              height=self.height, show='headings', style='Treeview')
         self.table.grid(row=row, column=column, sticky="nws", padx=5, pady=5)
         # Creating scroll bar for the table
         self.scroll = Scrollbar(root, orient='vertical', command=self.table.yview)
@@ -51,6 +83,182 @@ class Table:
             if item == 0:
                 self.table.column(item, width=30)
             self.table.heading(item, text=fields[item], anchor='nw')
-        # Populating the table with database rows
+            if self.sorter:
+                self.table.heading(item, command=lambda i=item: self.sort_by(i))
+
+    def fill(self, data):
+        """Inserts every row of the dataset"""
         for row_ in data:
-            self.table.insert('', 'end', values=" ".join(str(i).strip("\'") for i in row_))
+            self.table.insert('', 'end', values=values(row_))
+
+    def sort_by(self, column):
+        """Sorts by the column, descending if it was sorted ascending, the heading shows the order"""
+        self.descending = column == self.sorted and not self.descending
+        if self.sorted is not None:
+            self.table.heading(self.sorted, text=self.fields[self.sorted])
+        self.sorted = column
+        self.table.heading(column, text=self.fields[column] + (' \u25bc' if self.descending else ' \u25b2'))
+        self.sorter(column, self.descending)
+
+
+class VirtualTable(Table):
+    """VirtualTable class, a table of any number of rows keeping only the visible rows as treeview items.
+    The rows are fetched page by page from the database while scrolling, a few pages are kept.
+    A page following a kept page it's fetched after its last row, the offset it's used only for a jump.
+    A row may have more values than columns (e.g. its sort key), only the columns are shown.
+    :inherit: - Table.
+    :methods: - fill(data): - creates the items of the visible rows;
+              - reload(): - counts the rows again and shows the first rows;
+              - page(number) -> list: - returns the rows of a page, fetched if not kept;
+              - yview(*args): - scroll bar command, moves the visible rows;
+              - wheel(event): - mouse wheel event handler;
+              - move(offset): - sets the first visible row;
+              - render(): - shows the rows from the first visible row;
+              - sort_by(column): - sorts by the column through the query and shows the first rows;
+    """
+    def __init__(self, root, rem, count, fetch, fields: list, row: int, column: int, sorter=None):
+        """
+        Constructor.
+        :param root: - the frame where it will be displayed the table.
+        :param rem: - font size.
+        :param count: - callable() -> number of rows.
+        :param fetch: - callable(after, offset, limit) -> list of rows,
+                        after is the last row of the previous page or None if it's not kept.
+        :param fields: - columns name.
+        :param row: - row count.
+        :param column: - column count.
+        :param sorter: - callable(column, descending) changing the query, headings are clickable if given.
+        """
+        self.count, self.fetch = count, fetch
+        # number of rows, first visible row
+        self.total, self.offset = 0, 0
+        # page number -> rows, in least recently used order
+        self.pages = OrderedDict()
+        # treeview item of every visible row
+        self.items = []
+        Table.__init__(self, root, rem, None, fields, row, column, sorter)
+        # the scroll bar moves the rows instead of the treeview
+        self.scroll.configure(command=self.yview)
+        self.table.configure(yscrollcommand='')
+        self.table.bind('<MouseWheel>', self.wheel)
+        self.table.bind('<Button-4>', self.wheel)
+        self.table.bind('<Button-5>', self.wheel)
+        self.reload()
+
+    def fill(self, data):
+        """Creates the items of the visible rows once, they are updated in place"""
+        self.items = [self.table.insert('', 'end', values=()) for _ in range(self.height)]
+
+    def sort_by(self, column):
+        """Sorts by the column, the query it's changed by the sorter and the rows fetched again"""
+        Table.sort_by(self, column)
+        self.reload()
+
+    def reload(self):
+        """Counts the rows again, drops the fetched pages and shows the first rows"""
+        self.total = self.count()
+        self.pages.clear()
+        self.offset = 0
+        self.render()
+
+    def page(self, number):
+        """Returns the rows of the page, fetched from the database if it's not kept"""
+        rows = self.pages.get(number)
+        if rows is None:
+            previous = self.pages.get(number - 1)
+            rows = self.fetch(previous[-1] if previous else None, number * PAGE_SIZE, PAGE_SIZE)
+            self.pages[number] = rows
+            while len(self.pages) > PAGES_KEPT:
+                self.pages.popitem(last=False)
+        else:
+            self.pages.move_to_end(number)
+        return rows
+
+    def rows(self, offset, limit):
+        """Returns the rows from offset, at most limit rows"""
+        result = []
+        while len(result) < limit and offset < self.total:
+            number, start = divmod(offset, PAGE_SIZE)
+            rows = self.page(number)[start:start + limit - len(result)]
+            if not rows:
+                break
+            result.extend(rows)
+            offset += len(rows)
+        return result
+
+    def yview(self, *args):
+        """Scroll bar command: ('moveto', fraction) or ('scroll', number, 'units' or 'pages')"""
+        if args[0] == 'moveto':
+            offset = int(float(args[1]) * self.total)
+        else:
+            step = self.height if args[2] == 'pages' else 1
+            offset = self.offset + int(args[1]) * step
+        self.move(offset)
+
+    # noinspection PyUnresolvedReferences
+    def wheel(self, event):
+        """Mouse wheel event handler, 3 rows a notch"""
+        if event.num == 4 or event.delta > 0:
+            self.move(self.offset - 3)
+        else:
+            self.move(self.offset + 3)
+        return 'break'
+
+    def move(self, offset):
+        """Sets the first visible row and shows the rows"""
+        offset = max(0, min(offset, self.total - self.height))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def render(self):
+        """Shows the rows from the first visible row, the items without row are emptied"""
+        rows = self.rows(self.offset, self.height)
+        columns = len(self.fields)
+        for i, item in enumerate(self.items):
+            self.table.item(item, values=values(rows[i][:columns]) if i < len(rows) else ())
+        if self.total:
+            self.scroll.set(self.offset / self.total, min(1.0, (self.offset + self.height) / self.total))
+        else:
+            self.scroll.set(0.0, 1.0)
+
+
+class FilterBar(Frame):
+    """FilterBar class, difficulty level choice and user search above a table.
+    :inherit: - Frame from tkinter.
+    :methods: - apply(): - calls the filter callable with the chosen level and search text;
+    """
+    def __init__(self, root, rem, on_filter, search=True):
+        """
+        Constructor.
+        :param root: - the frame where it will be displayed the filter bar.
+        :param rem: - font size.
+        :param on_filter: - callable(level, search), level integer or None, search text or None.
+        :param search: - True to show the user search entry.
+        """
+        Frame.__init__(self, root, bg=var.colours['fg'])
+        self.on_filter = on_filter
+        # Level choice, All for every level
+        Label(self, text='Level', bg=var.colours['fg'], fg=var.colours['bg'],
+              font=var.get_font_size(rem, 3)).pack(side='left', padx=5)
+        self.level = Combobox(self, values=['All'] + [i.capitalize() for i in var.int_to_levels.values()],
+                              state='readonly', width=8, font=var.get_font_size(rem, 3))
+        self.level.current(0)
+        self.level.bind('<<ComboboxSelected>>', lambda event: self.apply())
+        self.level.pack(side='left', padx=5)
+        # User search, applied on Enter
+        self.search = None
+        if search:
+            Label(self, text='User', bg=var.colours['fg'], fg=var.colours['bg'],
+                  font=var.get_font_size(rem, 3)).pack(side='left', padx=5)
+            self.search = Entry(self, width=14, font=var.get_font_size(rem, 3))
+            self.search.bind('<Return>', lambda event: self.apply())
+            self.search.pack(side='left', padx=5)
+        Button(self, text='Filter', bg=var.colours['bg'], fg=var.colours['fg_enter'], bd=1,
+               font=var.get_font_size(rem, 3), command=self.apply).pack(side='left', padx=5)
+
+    def apply(self):
+        """Calls the filter callable with the chosen level integer and the search text"""
+        level = self.level.current() or None
+        search = self.search.get().strip() if self.search else ''
+        self.on_filter(level, search or None)
@@ -2,10 +2,15 @@
 
 # for creating an ordered dictionary
 from collections import OrderedDict
-# for adding image to buttons
-from PIL import Image, ImageTk
 # for display a message
 from tkinter import messagebox
+# for the button images in their original size, Tk 8.6 reads PNG files itself
+from tkinter import PhotoImage
+# for the shared fonts of the widgets
+from tkinter.font import Font
+
+# for the difficulty levels of the headless game
+import game_state
 
 
 """
@@ -24,8 +29,11 @@ ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
 categories = ['animal', 'plant', 'object', 'geography',
               'invention', 'history', 'sport', 'random']
 
-# Difficulty level dictionary
-int_to_levels = {1: 'easy', 2: 'medium', 3: 'hard'}
+# Tk images kept by the image cache, the least recently used are dropped first
+IMAGE_CACHE_SIZE = 16
+
+# Difficulty level dictionary, defined with the game state
+int_to_levels = game_state.int_to_levels
 
 # Message for win and lose
 result = {'won': 'Congratulation\n'
@@ -129,10 +137,40 @@ button_colours = OrderedDict([
 ])
 
 
-def get_png(var):
-    """return Tk image object for button"""
-    img = Image.open('PNG/{}.png'.format(var))
-    photo = ImageTk.PhotoImage(img)
+# Tk images in least recently used order, (name, size) -> PhotoImage
+photos = OrderedDict()
+
+
+def decode(name, size=None):
+    """Returns the decoded PIL image of PNG/<name>.png, scaled to size pixels on the longer side if given"""
+    # for reading the images, imported with the first image, not at startup
+    from PIL import Image
+    img = Image.open('PNG/{}.png'.format(name))
+    if size:
+        ratio = size / max(img.size)
+        img = img.resize((max(1, round(img.width * ratio)), max(1, round(img.height * ratio))))
+    return img
+
+
+def get_png(var, size=None):
+    """return Tk image object for button, shared by every caller of the same name and size.
+    The cache keeps a reference, so the image doesn't vanish when the caller drops its own.
+    The original size it's read by Tk, PIL it's needed only for a scaled image"""
+    key = (var, size)
+    photo = photos.get(key)
+    if photo is None:
+        if size:
+            # for adding a scaled image to buttons
+            from PIL import ImageTk
+            photo = ImageTk.PhotoImage(decode(var, size))
+        else:
+            photo = PhotoImage(file='PNG/{}.png'.format(var))
+        photos[key] = photo
+        # least recently used images dropped, a widget still showing one keeps its own reference
+        while len(photos) > IMAGE_CACHE_SIZE:
+            photos.popitem(last=False)
+    else:
+        photos.move_to_end(key)
     return photo
 
 
@@ -146,30 +184,36 @@ def message(key, value):
     messagebox.showinfo(key, value)
 
 
-def sort(item, boolean=False):
-    """Arranges the secret word letters in alphabetical order"""
-    char_list = []
-    for x in item:
-        if x in char_list:
-            continue
-        elif x in [' ', '-']:
-            continue
-        elif x == item[0] or x == item[len(item) - 1]:
-            if boolean:
-                char_list.append(x)
-            continue
-        else:
-            char_list.append(x)
-    return char_list
+# Shared fonts of the widgets, size step -> Font, rescaled all together by scale_fonts()
+fonts = {}
 
 
-def get_font_size(unit, size):
-    """Font setter for all the widgets"""
+def font_tuple(unit, size):
+    """Returns the family, point size and weight of a size step related to the unit (screen width)"""
     f, s, sy = 'Comic Sans MS', 1, 'bold'
-    rem = int(unit / 100 * (size * 0.05 + s))
+    rem = max(1, int(unit / 100 * (size * 0.05 + s)))
     return f, rem, sy
 
 
+def get_font_size(unit, size):
+    """Font setter for all the widgets, every widget of the same size step shares one Font.
+    The Font it's made on first use, its size follows scale_fonts() after"""
+    font = fonts.get(size)
+    if font is None:
+        f, rem, sy = font_tuple(unit, size)
+        font = Font(family=f, size=rem, weight=sy)
+        fonts[size] = font
+    return font
+
+
+def scale_fonts(unit):
+    """Resizes every shared font to the unit, only the changed fonts are configured"""
+    for size, font in fonts.items():
+        rem = font_tuple(unit, size)[1]
+        if font.cget('size') != rem:
+            font.configure(size=rem)
+
+
 def get_time(seconds):
     """Returns a tuple of integers for timing"""
     return int(seconds / 60), int(seconds % 60)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# Button states
+from tkinter import DISABLED, NORMAL
+import variables as var
+from game_state import bit
+
+
+"""
+View model of the button groups of the main window.
+The target options of every category, level and alphabet button are worked out from the game state,
+only the options different from the last ones sent are configured, all in one after_idle flush.
+
+Degree:         Faculty of Creative Arts, Technologies and Science
+Department:     Computer Science and Technology
+University:     University of Bedfordshire
+Author:         Oszkar Feher
+Date:           21 October 2022
+"""
+
+
+def category_options(selected, running):
+    """Options of a category button, the selected one it's disabled and the rest while a game runs"""
+    if selected or running:
+        return {'state': DISABLED, 'bg': var.colours['fg']}
+    return {'state': NORMAL, 'bg': var.colours['bg_cat_a']}
+
+
+def level_options(selected, running):
+    """Options of a difficulty level button, the selected one it's disabled and all while a game runs"""
+    return {'state': DISABLED if selected or running else NORMAL,
+            'bg': var.colours['fg'] if selected else var.colours['bg_level']}
+
+
+def letter_options(letter, state, running):
+    """Options of an alphabet button, from the letter masks of the running game"""
+    if not running:
+        return {'state': DISABLED, 'bg': var.colours['bg'], 'disabledforeground': var.colours['fg']}
+    # revealed from the start and good guesses are green, bad guesses red
+    if state.revealed_letter(letter) or state.guessed & bit(letter):
+        return {'state': DISABLED, 'bg': var.colours['bg'], 'disabledforeground': var.colours['dfg_abc_g']}
+    if state.missed & bit(letter):
+        return {'state': DISABLED, 'bg': var.colours['bg'], 'disabledforeground': var.colours['dfg_abc_r']}
+    return {'state': NORMAL, 'bg': var.colours['bg_abc_a'], 'disabledforeground': var.colours['bg']}
+
+
+class ViewModel:
+    """ViewModel class, caches the options of the widgets and sends only the changed ones.
+    :methods: - track(widget, **options): - registers the options a widget was created with;
+              - set(widget, **options): - target options of a widget, the changes are flushed when idle;
+              - flush(): - configures the changed options of every widget;
+    """
+    def __init__(self, master):
+        """
+        Constructor.
+        :param master: - Tk object the flush it's scheduled on.
+        """
+        self.master = master
+        # widget -> options last sent to Tk
+        self.current = {}
+        # widget -> changed options not yet sent
+        self.pending = {}
+        # scheduled after_idle flush or None
+        self.job = None
+
+    def track(self, widget, **options):
+        """Registers the options the widget was created with"""
+        self.current[widget] = dict(options)
+
+    def set(self, widget, **options):
+        """Sets the target options of the widget, only the changed options are kept for the flush"""
+        current = self.current.setdefault(widget, {})
+        pending = self.pending.get(widget, {})
+        for key, value in options.items():
+            if current.get(key) != value:
+                pending[key] = value
+            else:
+                # changed back before the flush
+                pending.pop(key, None)
+        if pending:
+            self.pending[widget] = pending
+            if self.job is None:
+                self.job = self.master.after_idle(self.flush)
+        else:
+            self.pending.pop(widget, None)
+
+    def flush(self):
+        """Configures the changed options, one configure call per changed widget"""
+        self.job = None
+        pending, self.pending = self.pending, {}
+        for widget, options in pending.items():
+            widget.configure(**options)
+            self.current[widget].update(options)